@@ -1,9 +1,10 @@
 """API v1 router"""
 
 from fastapi import APIRouter
+from app.core.responses import AppJSONResponse
 from .endpoints import auth, grievances, officers, health
 
-api_router = APIRouter(prefix="/api/v1")
+api_router = APIRouter(prefix="/api/v1", default_response_class=AppJSONResponse)
 
 # Include routers
 api_router.include_router(health.router, tags=["Health"])
@@ -1,13 +1,12 @@
 """Authentication endpoints"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserLogin, TokenResponse, PasswordChange, UserResponse
 from app.services.auth_service import AuthService
-from app.utils.dependencies import get_current_user
-from app.models.user import User
+from app.utils.dependencies import AuthenticatedUser, get_current_user, invalidate_user
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,7 +16,7 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new user.
@@ -28,7 +27,7 @@ async def register(
     - **phone**: Optional phone number
     - **role**: User role (citizen, officer, admin)
     """
-    success, message, user = AuthService.register_user(db, user_data)
+    success, message, user = await AuthService.register_user(db, user_data)
     
     if not success:
         raise HTTPException(
@@ -43,14 +42,14 @@ async def register(
 @router.post("/login", response_model=TokenResponse)
 async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Login user and get tokens.
     
     Returns access and refresh tokens for authenticated user.
     """
-    success, message, user = AuthService.authenticate_user(
+    success, message, user = await AuthService.authenticate_user(
         db, credentials.email, credentials.password
     )
     
@@ -94,7 +93,7 @@ async def refresh_token(refresh_token: str):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Get current user information.
@@ -105,13 +104,13 @@ async def get_current_user_info(
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChange,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Change user password.
     """
-    success, message = AuthService.change_password(
+    success, message = await AuthService.change_password(
         db,
         str(current_user.id),
         password_data.old_password,
@@ -124,4 +123,6 @@ async def change_password(
             detail=message
         )
     
+    await invalidate_user(current_user.id)
+    
     return {"message": "Password changed successfully"}
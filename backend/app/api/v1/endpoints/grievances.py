@@ -1,44 +1,86 @@
 """Grievance management endpoints"""
 
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Form
-from sqlalchemy.orm import Session
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, status, UploadFile, File, Query, Form, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
+from app.models.grievance import Grievance, GrievanceCategory, GrievanceStatus, GrievanceUrgency
 from app.schemas.grievance import (
-    GrievanceCreate, GrievanceResponse, GrievanceListResponse, GrievanceUpdate
+    GrievanceCreate, GrievanceResponse, GrievanceListResponse, GrievanceUpdate,
+    GRIEVANCE_LIST_ADAPTER
 )
-from app.schemas.timeline_event import TimelineEventResponse, GrievanceTimelineResponse
-from app.services.grievance_service import GrievanceService
-from app.services.ai_service import AIService
+from app.schemas.timeline_event import GrievanceTimelineResponse, TIMELINE_EVENT_LIST_ADAPTER
+from app.schemas.attachment import AttachmentResponse
+from app.services.grievance_service import (
+    GrievanceService, CITIZEN_CURSOR_TYPES, OFFICER_CURSOR_TYPES
+)
+from app.services.ai_batcher import AIBatcher
 from app.services.routing_service import RoutingService
+from app.services.file_service import FileService
 from app.services.notification_service import NotificationService
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import AuthenticatedUser, get_current_user, get_ai_queue
+from app.utils.pagination import decode_cursor
+from app.core.config import settings
+from app.core.responses import AppJSONResponse
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# Initialize services
-ai_service = AIService()
+# Number of recent grievances compared during duplicate detection
+DUPLICATE_LOOKBACK = 200
+
+# Streams attachments one JSON object at a time
+_ATTACHMENT_SERIALIZER = AttachmentResponse.__pydantic_serializer__
+
+# Lookup tables for status filters and submitted category/urgency values
+_STATUS_MAP = {s.value: s for s in GrievanceStatus}
+_CATEGORY_MAP = {c.value: c for c in GrievanceCategory}
+_URGENCY_MAP = {u.value: u for u in GrievanceUrgency}
+
+
+def _grievance_etag(grievance: Grievance) -> str:
+    """
+    Weak ETag for a grievance detail response.
+    
+    Adding an attachment doesn't touch the grievance row, so the attachment
+    count and newest upload time go into the tag next to updated_at.
+    """
+    attachments = grievance.attachments
+    newest = attachments[-1].uploaded_at.timestamp() if attachments else 0
+    return f'W/"{grievance.updated_at.timestamp()}-{len(attachments)}-{newest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the given ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
 
 
 @router.post("/submit", response_model=dict)
 async def submit_grievance(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: str = Form(...),
     category: Optional[str] = Form(None),
     urgency: Optional[str] = Form(None),
     location: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    ai_queue: AIBatcher = Depends(get_ai_queue),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Submit a new grievance with optional file attachment.
     """
-    logger.info(f"Grievance submission started by citizen {current_user.id}")
+    logger.info("Grievance submission started by citizen %s", current_user.id)
     
     # Validate grievance length
     if len(description) > 5000:
@@ -46,6 +88,25 @@ async def submit_grievance(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Grievance description too long (max 5000 characters)"
         )
+    
+    # User overrides are stored as enums, so reject unknown values up front
+    category_override = None
+    if category:
+        category_override = _CATEGORY_MAP.get(category)
+        if category_override is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid category: {category}"
+            )
+    
+    urgency_override = None
+    if urgency:
+        urgency_override = _URGENCY_MAP.get(urgency)
+        if urgency_override is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid urgency: {urgency}"
+            )
 
     # Prepare grievance data object
     grievance_data = GrievanceCreate(
@@ -54,36 +115,39 @@ async def submit_grievance(
         category=None # Will be determined by AI
     )
     
-    # Get existing grievances for duplicate detection
-    existing_grievances = db.query(Grievance).filter(
-        Grievance.citizen_id == current_user.id
-    ).all()
+    # Get the citizen's recent grievances for duplicate detection
+    result = await db.execute(
+        select(Grievance.id, Grievance.description, Grievance.status)
+        .where(Grievance.citizen_id == current_user.id)
+        .order_by(Grievance.created_at.desc())
+        .limit(DUPLICATE_LOOKBACK)
+    )
     
     existing_docs = [
         {
-            "id": str(g.id),
-            "text": g.description,
-            "status": g.status.value
+            "id": str(grievance_id),
+            "text": text,
+            "status": grievance_status.value
         }
-        for g in existing_grievances
+        for grievance_id, text, grievance_status in result
     ]
     
     # Run AI analysis
-    ai_analysis = ai_service.analyze_grievance(
+    ai_analysis = await ai_queue.submit(
         description,
         existing_docs
     )
     
     # Override category/urgency if provided by user, otherwise use AI result
-    if category:
-        ai_analysis["category"] = category
-    if urgency:
-        ai_analysis["urgency"] = urgency
+    if category_override:
+        ai_analysis["category"] = category_override
+    if urgency_override:
+        ai_analysis["urgency"] = urgency_override
         
-    logger.info(f"AI analysis complete: {ai_analysis}")
+    logger.info("AI analysis complete: %s", ai_analysis)
     
     # Route to department
-    routing_result = RoutingService.route_grievance(
+    routing_result = await RoutingService.route_grievance(
         db,
         grievance_id="temp",
         category=ai_analysis["category"],
@@ -91,18 +155,17 @@ async def submit_grievance(
         is_duplicate=ai_analysis["is_duplicate"]
     )
     
-    if not routing_result["success"]:
+    if not routing_result.success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=routing_result["message"]
+            detail=routing_result.message
         )
     
     # Create grievance
-    from app.models.grievance import Grievance
-    grievance = GrievanceService.create_grievance(
+    grievance = await GrievanceService.create_grievance(
         db,
-        citizen_id=str(current_user.id),
-        department_id=routing_result["department_id"],
+        citizen_id=current_user.id,
+        department_id=routing_result.department_id,
         grievance_data=grievance_data,
         ai_analysis=ai_analysis
     )
@@ -115,29 +178,29 @@ async def submit_grievance(
         
     # Handle File Upload
     if file:
-        from app.services.file_service import FileService
         upload_result = FileService.save_upload(file)
         
         if upload_result["success"]:
-            GrievanceService.add_attachment(
+            await GrievanceService.add_attachment(
                 db=db,
-                grievance_id=str(grievance.id),
+                grievance_id=grievance.id,
                 file_name=upload_result["file_name"],
                 file_size=upload_result["file_size"],
                 file_type=upload_result["file_type"],
                 file_url=upload_result["file_url"],
-                uploaded_by=str(current_user.id)
+                uploaded_by=current_user.id
             )
             # Update grievance with image_url if it's an image
             if upload_result["file_type"].startswith("image/"):
-                GrievanceService.update_image_url(
+                await GrievanceService.update_image_url(
                     db=db,
-                    grievance_id=str(grievance.id),
+                    grievance_id=grievance.id,
                     image_url=upload_result["file_url"]
                 )
     
-    # Send notification
-    NotificationService.notify_grievance_submitted(
+    # Send notification after the response is returned
+    background_tasks.add_task(
+        NotificationService.notify_grievance_submitted,
         recipient_email=current_user.email,
         citizen_name=current_user.full_name,
         grievance_id=str(grievance.id),
@@ -145,7 +208,7 @@ async def submit_grievance(
         urgency=grievance.urgency.value
     )
     
-    logger.info(f"Grievance created successfully: {grievance.id}")
+    logger.info("Grievance created successfully: %s", grievance.id)
     
     return {
         "success": True,
@@ -154,19 +217,33 @@ async def submit_grievance(
         "message": "Grievance submitted successfully",
         "category": grievance.category.value,
         "urgency": grievance.urgency.value,
-        "department": routing_result["department_name"],
+        "department": routing_result.department_name,
         "ai_confidence": ai_analysis["ai_confidence"],
         "is_duplicate": ai_analysis["is_duplicate"]
     }
 
 
+def _parse_cursor(cursor: Optional[str], types: tuple) -> Optional[tuple]:
+    """Decode a cursor query parameter, rejecting malformed tokens with a 400"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, types)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("/", response_model=GrievanceListResponse)
 async def list_grievances(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    status: Optional[str] = None
+    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = Query(None)
 ):
     """
     List grievances based on user role.
@@ -174,80 +251,91 @@ async def list_grievances(
     - **Citizens**: See their own grievances
     - **Officers**: See assigned grievances
     - **Admins**: See all grievances
+    
+    Citizens and officers can pass the `next_cursor` of a page as `cursor`
+    to fetch the page after it; `skip` is ignored when a cursor is given.
     """
+    next_cursor = None
+    has_more = False
     if current_user.role == UserRole.CITIZEN:
         # Citizen can only see their own grievances
-        from app.models.grievance import GrievanceStatus
         grievance_status = None
-        if status:
-            try:
-                grievance_status = GrievanceStatus(status)
-            except ValueError:
+        if status_filter:
+            grievance_status = _STATUS_MAP.get(status_filter)
+            if grievance_status is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid status"
                 )
         
-        grievances, total = GrievanceService.get_citizen_grievances(
-            db, str(current_user.id), skip, limit, grievance_status
+        grievances, has_more, next_cursor = await GrievanceService.get_citizen_grievances(
+            db, current_user.id, skip, limit, grievance_status,
+            cursor=_parse_cursor(cursor, CITIZEN_CURSOR_TYPES)
+        )
+        total = await GrievanceService.get_citizen_grievance_count(
+            db, current_user.id, grievance_status
         )
         
     elif current_user.role == UserRole.OFFICER:
         # Officer can see assigned grievances
-        from app.models.grievance import GrievanceStatus, GrievanceUrgency
         grievance_status = None
         urgency = None
         
-        if status:
-            try:
-                grievance_status = GrievanceStatus(status)
-            except ValueError:
+        if status_filter:
+            grievance_status = _STATUS_MAP.get(status_filter)
+            if grievance_status is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid status"
                 )
         
-        grievances, total = GrievanceService.get_officer_grievances(
-            db, str(current_user.id), skip, limit, grievance_status, urgency
+        grievances, has_more, next_cursor = await GrievanceService.get_officer_grievances(
+            db, current_user.id, skip, limit, grievance_status, urgency,
+            cursor=_parse_cursor(cursor, OFFICER_CURSOR_TYPES)
+        )
+        total = await GrievanceService.get_officer_grievance_count(
+            db, current_user.id, grievance_status, urgency
         )
         
     elif current_user.role == UserRole.ADMIN:
         # Admin can see all grievances
-        from app.models.grievance import Grievance
-        query = db.query(Grievance)
-        
-        if status:
-            from app.models.grievance import GrievanceStatus
-            try:
-                grievance_status = GrievanceStatus(status)
-                query = query.filter(Grievance.status == grievance_status)
-            except ValueError:
+        grievance_status = None
+        if status_filter:
+            grievance_status = _STATUS_MAP.get(status_filter)
+            if grievance_status is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid status"
                 )
         
-        total = query.count()
-        grievances = query.order_by(Grievance.created_at.desc()).offset(skip).limit(limit).all()
+        grievances, total = await GrievanceService.get_all_grievances(
+            db, skip, limit, grievance_status
+        )
+        has_more = skip + len(grievances) < total
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized"
         )
     
-    return GrievanceListResponse(
-        items=[GrievanceResponse.from_orm(g) for g in grievances],
-        total=total,
-        skip=skip,
-        limit=limit
+    return AppJSONResponse(
+        GrievanceListResponse(
+            items=GRIEVANCE_LIST_ADAPTER.validate_python(grievances, from_attributes=True),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=has_more,
+            next_cursor=next_cursor
+        )
     )
 
 
 @router.get("/{grievance_id}", response_model=GrievanceResponse)
 async def get_grievance(
-    grievance_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    grievance_id: UUID,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get grievance details by ID.
@@ -257,7 +345,9 @@ async def get_grievance(
     - Officer can view assigned grievances
     - Admin can view any grievance
     """
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance, allowed = await GrievanceService.get_grievance_for_user(
+        db, grievance_id, current_user.id, current_user.role
+    )
     
     if not grievance:
         raise HTTPException(
@@ -265,29 +355,30 @@ async def get_grievance(
             detail="Grievance not found"
         )
     
-    # Check permissions
-    if current_user.role == UserRole.CITIZEN:
-        if grievance.citizen_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to view this grievance"
-            )
-    elif current_user.role == UserRole.OFFICER:
-        if grievance.officer_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to view this grievance"
-            )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this grievance"
+        )
+    
+    # Unchanged grievances answer polling clients with an empty 304
+    etag = _grievance_etag(grievance)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     
-    return GrievanceResponse.from_orm(grievance)
+    return AppJSONResponse(
+        GrievanceResponse.model_validate(grievance),
+        headers={"ETag": etag}
+    )
 
 
 @router.put("/{grievance_id}/status", response_model=dict)
 async def update_grievance_status(
-    grievance_id: str,
+    grievance_id: UUID,
     update_data: GrievanceUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update grievance status.
@@ -300,7 +391,7 @@ async def update_grievance_status(
             detail="Only officers can update grievance status"
         )
     
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance = await GrievanceService.get_grievance(db, grievance_id)
     
     if not grievance:
         raise HTTPException(
@@ -315,22 +406,24 @@ async def update_grievance_status(
             detail="Not authorized to update this grievance"
         )
     
-    from app.models.grievance import GrievanceStatus
-    try:
-        new_status = GrievanceStatus(update_data.status)
-    except ValueError:
+    new_status = _STATUS_MAP.get(update_data.status)
+    if new_status is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid status"
         )
     
-    success = GrievanceService.update_grievance_status(
+    # The service updates this same instance, so keep the old value for the email
+    previous_status = grievance.status
+    
+    success = await GrievanceService.update_grievance_status(
         db,
         grievance_id,
         new_status,
-        str(current_user.id),
+        current_user.id,
         current_user.role.value,
-        update_data.comment
+        update_data.comment,
+        previous_status=previous_status
     )
     
     if not success:
@@ -340,15 +433,15 @@ async def update_grievance_status(
         )
     
     # Send notification to citizen
-    from app.models.user import User as UserModel
-    citizen = db.query(UserModel).filter(UserModel.id == grievance.citizen_id).first()
+    citizen = grievance.citizen
     
     if citizen:
-        NotificationService.notify_status_update(
+        background_tasks.add_task(
+            NotificationService.notify_status_update,
             recipient_email=citizen.email,
             citizen_name=citizen.full_name,
-            grievance_id=grievance_id,
-            previous_status=grievance.status.value,
+            grievance_id=str(grievance_id),
+            previous_status=previous_status.value,
             new_status=new_status.value,
             comment=update_data.comment
         )
@@ -362,16 +455,21 @@ async def update_grievance_status(
 
 @router.get("/{grievance_id}/timeline", response_model=GrievanceTimelineResponse)
 async def get_timeline(
-    grievance_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    grievance_id: UUID,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get grievance timeline (status history and events).
     
     Citizens only see events visible to them.
     """
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    # Officers may follow the history of any grievance
+    grievance, allowed = await GrievanceService.get_grievance_for_user(
+        db, grievance_id, current_user.id, current_user.role,
+        officer_must_be_assigned=False, load_attachments=False
+    )
     
     if not grievance:
         raise HTTPException(
@@ -379,32 +477,79 @@ async def get_timeline(
             detail="Grievance not found"
         )
     
-    # Check permissions
-    if current_user.role == UserRole.CITIZEN:
-        if grievance.citizen_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized"
-            )
-        citizen_view = True
-    else:
-        citizen_view = False
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    citizen_view = current_user.role == UserRole.CITIZEN
+    
+    timeline = await GrievanceService.get_timeline(db, grievance_id, citizen_view)
     
-    timeline = GrievanceService.get_timeline(db, grievance_id, citizen_view)
+    # Events are append-only, so the newest event and the count identify the timeline
+    last_event_at = timeline[-1].created_at.timestamp() if timeline else 0
+    etag = f'W/"{int(citizen_view)}-{len(timeline)}-{last_event_at}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return AppJSONResponse(
+        GrievanceTimelineResponse(
+            grievance_id=str(grievance_id),
+            events=TIMELINE_EVENT_LIST_ADAPTER.validate_python(timeline, from_attributes=True),
+            total_events=len(timeline)
+        ),
+        headers={"ETag": etag}
+    )
+
+
+@router.get("/{grievance_id}/attachments", response_model=list[AttachmentResponse])
+async def list_attachments(
+    grievance_id: UUID,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List a grievance's attachments, oldest first.
     
-    return GrievanceTimelineResponse(
-        grievance_id=grievance_id,
-        events=[TimelineEventResponse.from_orm(event) for event in timeline],
-        total_events=len(timeline)
+    The JSON array is streamed as rows arrive from the database, so large
+    attachment lists are never held in memory all at once.
+    """
+    grievance, allowed = await GrievanceService.get_grievance_for_user(
+        db, grievance_id, current_user.id, current_user.role,
+        load_attachments=False
     )
+    
+    if not grievance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Grievance not found"
+        )
+    
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    async def body():
+        separator = b"["
+        async for attachment in GrievanceService.iter_attachments(db, grievance_id):
+            yield separator + _ATTACHMENT_SERIALIZER.to_json(
+                AttachmentResponse.model_validate(attachment)
+            )
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.post("/{grievance_id}/comment")
 async def add_comment(
-    grievance_id: str,
-    comment: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    grievance_id: UUID,
+    comment: str = Body(..., embed=True),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Add comment to grievance.
@@ -412,7 +557,10 @@ async def add_comment(
     Citizens can add visible comments.
     Officers can add comments (visible flag determined by role).
     """
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance, allowed = await GrievanceService.get_grievance_for_user(
+        db, grievance_id, current_user.id, current_user.role,
+        load_attachments=False
+    )
     
     if not grievance:
         raise HTTPException(
@@ -420,24 +568,16 @@ async def add_comment(
             detail="Grievance not found"
         )
     
-    # Check permissions
-    if current_user.role == UserRole.CITIZEN:
-        if grievance.citizen_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized"
-            )
-    elif current_user.role == UserRole.OFFICER:
-        if grievance.officer_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized"
-            )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
     
-    success = GrievanceService.add_comment(
+    success = await GrievanceService.add_comment(
         db,
         grievance_id,
-        str(current_user.id),
+        current_user.id,
         current_user.role.value,
         comment,
         is_visible_to_citizen=True
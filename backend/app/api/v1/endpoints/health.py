@@ -1,26 +1,31 @@
 """Health check endpoint"""
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 from app.core.config import settings
 
 router = APIRouter()
 
+# Bodies are constant for the life of the process, so encode them once
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "version": settings.app_version,
+    "environment": settings.environment
+})
+_ROOT_BODY = orjson.dumps({
+    "app": settings.app_name,
+    "version": settings.app_version,
+    "message": "Smart Griev API - AI-Powered Grievance Management System"
+})
+
 
 @router.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": settings.app_version,
-        "environment": settings.environment
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.get("/", tags=["Health"])
 async def root():
     """Root endpoint"""
-    return {
-        "app": settings.app_name,
-        "version": settings.app_version,
-        "message": "Smart Griev API - AI-Powered Grievance Management System"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
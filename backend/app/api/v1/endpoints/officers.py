@@ -1,30 +1,43 @@
 """Officer workflow endpoints"""
 
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.models.user import User, UserRole
-from app.models.grievance import Grievance, GrievanceStatus
-from app.schemas.grievance import GrievanceResponse, GrievanceListResponse
-from app.services.grievance_service import GrievanceService
-from app.utils.dependencies import get_current_user
+from app.models.grievance import Grievance, GrievanceStatus, GrievanceUrgency
+from app.schemas.grievance import GrievanceListResponse, GRIEVANCE_LIST_ADAPTER
+from app.services.grievance_service import GrievanceService, OFFICER_CURSOR_TYPES
+from app.services.notification_service import NotificationService
+from app.services.routing_service import RoutingService
+from app.utils.dependencies import AuthenticatedUser, get_current_user
+from app.utils.pagination import decode_cursor
+from app.core.config import settings
+from app.core.responses import AppJSONResponse
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Lookup tables for filter query parameters
+_STATUS_MAP = {s.value: s for s in GrievanceStatus}
+_URGENCY_MAP = {u.value: u for u in GrievanceUrgency}
+
 
 @router.get("/me/assigned", response_model=GrievanceListResponse)
 async def get_assigned_grievances(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     status_filter: Optional[str] = None,
     urgency_filter: Optional[str] = None,
-    sort_by: str = Query("priority", regex="^(priority|created|urgency)$")
+    sort_by: str = Query("priority", regex="^(priority|created|urgency)$"),
+    cursor: Optional[str] = None
 ):
     """
     Get grievances assigned to current officer.
@@ -33,6 +46,7 @@ async def get_assigned_grievances(
     - `status_filter`: Filter by status (submitted, under_review, in_progress, resolved, closed)
     - `urgency_filter`: Filter by urgency (low, medium, high, critical)
     - `sort_by`: Sort by priority (default), created date, or urgency
+    - `cursor`: `next_cursor` of the previous page; `skip` is ignored when given
     """
     # Only officers and admins can access
     if current_user.role not in [UserRole.OFFICER, UserRole.ADMIN]:
@@ -44,9 +58,8 @@ async def get_assigned_grievances(
     # Parse filters
     status_enum = None
     if status_filter:
-        try:
-            status_enum = GrievanceStatus(status_filter)
-        except ValueError:
+        status_enum = _STATUS_MAP.get(status_filter)
+        if status_enum is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status: {status_filter}"
@@ -54,38 +67,56 @@ async def get_assigned_grievances(
     
     urgency_enum = None
     if urgency_filter:
-        from app.models.grievance import GrievanceUrgency
+        urgency_enum = _URGENCY_MAP.get(urgency_filter)
+        if urgency_enum is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid urgency: {urgency_filter}"
+            )
+    
+    cursor_key = None
+    if cursor:
         try:
-            urgency_enum = GrievanceUrgency(urgency_filter)
+            cursor_key = decode_cursor(cursor, OFFICER_CURSOR_TYPES)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid urgency: {urgency_filter}"
+                detail="Invalid cursor"
             )
     
     # Get grievances
-    grievances, total = GrievanceService.get_officer_grievances(
+    grievances, has_more, next_cursor = await GrievanceService.get_officer_grievances(
         db,
-        str(current_user.id),
+        current_user.id,
         skip,
         limit,
         status_enum,
-        urgency_enum
+        urgency_enum,
+        cursor=cursor_key
     )
     
-    return GrievanceListResponse(
-        items=[GrievanceResponse.from_orm(g) for g in grievances],
-        total=total,
-        skip=skip,
-        limit=limit
+    # Totals come from a separately cached count, not the page query
+    total = await GrievanceService.get_officer_grievance_count(
+        db, current_user.id, status_enum, urgency_enum
+    )
+    
+    return AppJSONResponse(
+        GrievanceListResponse(
+            items=GRIEVANCE_LIST_ADAPTER.validate_python(grievances, from_attributes=True),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=has_more,
+            next_cursor=next_cursor
+        )
     )
 
 
 @router.post("/{grievance_id}/accept")
 async def accept_grievance(
-    grievance_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    grievance_id: UUID,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Officer accepts grievance (mark as under review).
@@ -97,7 +128,7 @@ async def accept_grievance(
             detail="Only officers can accept grievances"
         )
     
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance = await GrievanceService.get_grievance(db, grievance_id)
     
     if not grievance:
         raise HTTPException(
@@ -114,7 +145,7 @@ async def accept_grievance(
     
     # Assign if not already assigned
     if not grievance.officer_id:
-        success = GrievanceService.assign_officer(db, grievance_id, str(current_user.id))
+        success = await GrievanceService.assign_officer(db, grievance_id, current_user.id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,13 +153,14 @@ async def accept_grievance(
             )
     else:
         # Update status if already assigned
-        success = GrievanceService.update_grievance_status(
+        success = await GrievanceService.update_grievance_status(
             db,
             grievance_id,
             GrievanceStatus.UNDER_REVIEW,
-            str(current_user.id),
+            current_user.id,
             "officer",
-            "Grievance accepted for review"
+            "Grievance accepted for review",
+            previous_status=grievance.status
         )
         if not success:
             raise HTTPException(
@@ -145,10 +177,10 @@ async def accept_grievance(
 
 @router.post("/{grievance_id}/mark-in-progress")
 async def mark_in_progress(
-    grievance_id: str,
+    grievance_id: UUID,
     comment: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Mark grievance as in progress.
@@ -159,7 +191,7 @@ async def mark_in_progress(
             detail="Only officers can mark as in progress"
         )
     
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance = await GrievanceService.get_grievance(db, grievance_id)
     
     if not grievance:
         raise HTTPException(
@@ -173,13 +205,14 @@ async def mark_in_progress(
             detail="Not assigned to you"
         )
     
-    success = GrievanceService.update_grievance_status(
+    success = await GrievanceService.update_grievance_status(
         db,
         grievance_id,
         GrievanceStatus.IN_PROGRESS,
-        str(current_user.id),
+        current_user.id,
         "officer",
-        comment or "Work started on this grievance"
+        comment or "Work started on this grievance",
+        previous_status=grievance.status
     )
     
     if not success:
@@ -196,10 +229,11 @@ async def mark_in_progress(
 
 @router.post("/{grievance_id}/resolve")
 async def resolve_grievance(
-    grievance_id: str,
+    grievance_id: UUID,
     resolution_details: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Mark grievance as resolved with details.
@@ -210,7 +244,7 @@ async def resolve_grievance(
             detail="Only officers can resolve grievances"
         )
     
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    grievance = await GrievanceService.get_grievance(db, grievance_id)
     
     if not grievance:
         raise HTTPException(
@@ -224,13 +258,14 @@ async def resolve_grievance(
             detail="Not assigned to you"
         )
     
-    success = GrievanceService.update_grievance_status(
+    success = await GrievanceService.update_grievance_status(
         db,
         grievance_id,
         GrievanceStatus.RESOLVED,
-        str(current_user.id),
+        current_user.id,
         "officer",
-        f"Resolution: {resolution_details}"
+        f"Resolution: {resolution_details}",
+        previous_status=grievance.status
     )
     
     if not success:
@@ -240,21 +275,15 @@ async def resolve_grievance(
         )
     
     # Send notification to citizen
-    from app.models.user import User as UserModel
-    from app.services.notification_service import NotificationService
-    
-    citizen = db.query(UserModel).filter(UserModel.id == grievance.citizen_id).first()
+    citizen = grievance.citizen
     
     if citizen:
-        department = db.query(Grievance.__table__.c.department_id).filter(
-            Grievance.id == grievance.id
-        ).first()
-        
-        NotificationService.notify_grievance_resolved(
+        background_tasks.add_task(
+            NotificationService.notify_grievance_resolved,
             recipient_email=citizen.email,
             citizen_name=citizen.full_name,
-            grievance_id=grievance_id,
-            department_name="Department",  # Should fetch from DB
+            grievance_id=str(grievance_id),
+            department_name=grievance.department.name if grievance.department else "Department",
             resolution_details=resolution_details
         )
     
@@ -265,42 +294,132 @@ async def resolve_grievance(
     }
 
 
+@router.get("/escalation-check")
+async def list_escalations(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List all open grievances that have passed the escalation threshold.
+    """
+    if current_user.role not in [UserRole.OFFICER, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    grievance_ids = await GrievanceService.get_overdue_grievances(
+        db, settings.escalation_time_hours
+    )
+    
+    return {
+        "grievance_ids": grievance_ids,
+        "total": len(grievance_ids),
+        "escalation_threshold_hours": settings.escalation_time_hours
+    }
+
+
+@router.post("/assign-backlog")
+async def assign_backlog(
+    background_tasks: BackgroundTasks,
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Assign submitted grievances no officer has picked up (admin only).
+    
+    Highest priority first, each grievance goes to the least loaded active
+    officer of its department. Officers are emailed in one batch after the
+    response is returned.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can assign grievances in bulk"
+        )
+    
+    grievances = await GrievanceService.get_unassigned_grievances(db, limit)
+    officer_ids = await RoutingService.assign_officers_bulk(
+        db, [grievance.department_id for grievance in grievances]
+    )
+    
+    assigned = await GrievanceService.assign_officers(
+        db,
+        [
+            (grievance.id, officer_id)
+            for grievance, officer_id in zip(grievances, officer_ids)
+            if officer_id is not None
+        ],
+        current_user.id
+    )
+    
+    if assigned:
+        assigned_ids = set(assigned)
+        handed_out = [
+            (grievance, officer_id)
+            for grievance, officer_id in zip(grievances, officer_ids)
+            if grievance.id in assigned_ids
+        ]
+        result = await db.execute(
+            select(User.id, User.full_name, User.email).where(User.id.in_(
+                {officer_id for _, officer_id in handed_out}
+                | {grievance.citizen_id for grievance, _ in handed_out}
+            ))
+        )
+        users = {user.id: user for user in result}
+        
+        background_tasks.add_task(NotificationService.send_batch, [
+            NotificationService.officer_assignment(
+                recipient_email=users[officer_id].email,
+                officer_name=users[officer_id].full_name,
+                grievance_id=str(grievance.id),
+                citizen_name=users[grievance.citizen_id].full_name,
+                category=grievance.category.value,
+                urgency=grievance.urgency.value,
+                priority_score=grievance.priority_score,
+                grievance_text=grievance.description
+            )
+            for grievance, officer_id in handed_out
+        ])
+    
+    return {
+        "assigned": len(assigned),
+        "unassigned": len(grievances) - len(assigned)
+    }
+
+
 @router.get("/{grievance_id}/escalation-check")
 async def check_escalation(
-    grievance_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    grievance_id: UUID,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Check if grievance needs escalation based on time.
     """
-    from datetime import datetime, timedelta
-    from app.core.config import settings
-    
     if current_user.role not in [UserRole.OFFICER, UserRole.ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized"
         )
     
-    grievance = GrievanceService.get_grievance(db, grievance_id)
+    escalation = await GrievanceService.get_escalation_status(
+        db, grievance_id, settings.escalation_time_hours
+    )
     
-    if not grievance:
+    if not escalation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Grievance not found"
         )
     
-    # Check if grievance is overdue
-    time_elapsed = datetime.utcnow() - grievance.created_at
-    escalation_threshold = timedelta(hours=settings.escalation_time_hours)
-    
-    needs_escalation = time_elapsed > escalation_threshold
+    time_elapsed = datetime.utcnow() - escalation["created_at"]
     
     return {
         "grievance_id": grievance_id,
-        "needs_escalation": needs_escalation,
+        "needs_escalation": escalation["needs_escalation"],
         "time_elapsed_hours": time_elapsed.total_seconds() / 3600,
         "escalation_threshold_hours": settings.escalation_time_hours,
-        "status": grievance.status.value
+        "status": escalation["status"].value
     }
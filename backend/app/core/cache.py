@@ -0,0 +1,44 @@
+"""Shared Redis client for caching"""
+
+from typing import Optional
+import redis as sync_redis
+import redis.asyncio as redis
+from .config import settings
+
+_client: Optional[redis.Redis] = None
+_sync_client: Optional[sync_redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared async Redis client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_timeout_seconds,
+            socket_timeout=settings.redis_timeout_seconds,
+        )
+    return _client
+
+
+def get_sync_redis() -> sync_redis.Redis:
+    """Get the shared blocking Redis client for code running outside the event loop"""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = sync_redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_timeout_seconds,
+            socket_timeout=settings.redis_timeout_seconds,
+        )
+    return _sync_client
+
+
+async def close_redis():
+    """Close the shared Redis clients"""
+    global _client, _sync_client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
@@ -1,96 +1,134 @@
 """Application configuration and environment settings"""
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables from .env file
+# Environment variables can also be provided in a .env file
 env_path = Path(__file__).parent.parent.parent / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
 
 
-class Settings:
-    """Application settings loaded from environment variables"""
-    
-    def __init__(self):
-        # Application
-        self.app_name = "Smart Griev - AI-Powered Grievance Management"
-        self.app_version = "1.0.0"
-        self.environment = os.getenv("ENVIRONMENT", "development")
-        self.debug = os.getenv("DEBUG", "True").lower() == "true"
-        self.log_level = os.getenv("LOG_LEVEL", "INFO")
-        
-        # Server
-        self.host = os.getenv("HOST", "0.0.0.0")
-        self.port = int(os.getenv("PORT", "8000"))
-        self.api_v1_str = "/api/v1"
-        self.backend_cors_origins = [
-            "http://localhost:3000",
-            "http://localhost:5173",
-            "http://localhost:8000",
-        ]
-        
-        # Database
-        self.database_type = os.getenv("DATABASE_TYPE", "postgresql")
-        self.database_url = os.getenv(
-            "DATABASE_URL",
-            "sqlite:///./smartgriev.db"
-        )
-        self.mongodb_url = os.getenv("MONGODB_URL")
-        
-        # Firebase Authentication
-        self.firebase_project_id = os.getenv("FIREBASE_PROJECT_ID")
-        self.firebase_private_key_id = os.getenv("FIREBASE_PRIVATE_KEY_ID")
-        self.firebase_private_key = os.getenv("FIREBASE_PRIVATE_KEY")
-        self.firebase_client_email = os.getenv("FIREBASE_CLIENT_EMAIL")
-        self.firebase_client_id = os.getenv("FIREBASE_CLIENT_ID")
-        
-        # JWT
-        self.secret_key = os.getenv("SECRET_KEY", "dev-secret-key-12345")
-        self.algorithm = os.getenv("ALGORITHM", "HS256")
-        self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-        self.refresh_token_expire_days = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
-        
-        # AI/NLP
-        self.nlp_model = os.getenv("NLP_MODEL", "bert")
-        self.tf_idf_min_df = int(os.getenv("TF_IDF_MIN_DF", "2"))
-        self.tf_idf_max_df = float(os.getenv("TF_IDF_MAX_DF", "0.95"))
-        self.similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.75"))
-        self.max_grievance_length = int(os.getenv("MAX_GRIEVANCE_LENGTH", "5000"))
-        
-        # Email
-        self.sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
-        self.sendgrid_from_email = os.getenv("SENDGRID_FROM_EMAIL", "noreply@smartgriev.com")
-        self.sendgrid_from_name = os.getenv("SENDGRID_FROM_NAME", "Smart Griev")
-        
-        # Cloud Storage
-        self.aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-        self.aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-        self.aws_s3_bucket_name = os.getenv("AWS_S3_BUCKET_NAME", "smartgriev-attachments")
-        self.aws_region = os.getenv("AWS_REGION", "us-east-1")
-        
-        # Google Cloud
-        self.google_cloud_project_id = os.getenv("GOOGLE_CLOUD_PROJECT_ID")
-        self.google_cloud_storage_bucket = os.getenv("GOOGLE_CLOUD_STORAGE_BUCKET", "smartgriev-attachments")
-        
-        # Redis
-        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        self.redis_host = os.getenv("REDIS_HOST", "localhost")
-        self.redis_port = int(os.getenv("REDIS_PORT", "6379"))
-        self.redis_db = int(os.getenv("REDIS_DB", "0"))
-        
-        # Celery
-        self.celery_broker_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
-        self.celery_result_backend = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
-        
-        # Business Logic
-        self.default_response_time_hours = int(os.getenv("DEFAULT_RESPONSE_TIME_HOURS", "48"))
-        self.escalation_time_hours = int(os.getenv("ESCALATION_TIME_HOURS", "72"))
-        
-        # Logging
-        self.log_file = os.getenv("LOG_FILE", "logs/app.log")
+class Settings(BaseSettings):
+    """
+    Application settings loaded from environment variables.
+    
+    Each field is read from the environment variable of the same name
+    (case-insensitive), falling back to the .env file and then the default.
+    """
+    
+    model_config = SettingsConfigDict(
+        env_file=env_path,
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
+    
+    # Application
+    app_name: str = "Smart Griev - AI-Powered Grievance Management"
+    app_version: str = "1.0.0"
+    environment: str = "development"
+    debug: bool = True
+    log_level: str = "INFO"
+    
+    # Server
+    host: str = "0.0.0.0"
+    port: int = 8000
+    api_v1_str: str = "/api/v1"
+    backend_cors_origins: Tuple[str, ...] = (
+        "http://localhost:3000",
+        "http://localhost:5173",
+        "http://localhost:8000",
+    )
+    
+    # Database
+    database_type: str = "postgresql"
+    database_url: str = "sqlite:///./smartgriev.db"
+    mongodb_url: Optional[str] = None
+    db_pool_size: int = min(32, (os.cpu_count() or 1) * 4)
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    sql_echo: bool = False
+    
+    # Firebase Authentication
+    firebase_project_id: Optional[str] = None
+    firebase_private_key_id: Optional[str] = None
+    firebase_private_key: Optional[str] = None
+    firebase_client_email: Optional[str] = None
+    firebase_client_id: Optional[str] = None
+    
+    # JWT
+    secret_key: str = "dev-secret-key-12345"
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 7
+    
+    # Password hashing (argon2id, memory cost in KiB)
+    argon2_time_cost: int = 2
+    argon2_memory_cost: int = 19456
+    argon2_parallelism: int = 1
+    password_hash_workers: int = os.cpu_count() or 1
+    
+    # AI/NLP
+    nlp_model: str = "bert"
+    tf_idf_min_df: int = 2
+    tf_idf_max_df: float = 0.95
+    similarity_threshold: float = 0.75
+    max_grievance_length: int = 5000
+    ai_batch_size: int = 8
+    ai_batch_wait_ms: int = 20
+    
+    # Email
+    sendgrid_api_key: Optional[str] = None
+    sendgrid_from_email: str = "noreply@smartgriev.com"
+    sendgrid_from_name: str = "Smart Griev"
+    async_notifications: bool = False
+    notification_dedup_seconds: int = 300
+    
+    # Cloud Storage
+    aws_access_key_id: Optional[str] = None
+    aws_secret_access_key: Optional[str] = None
+    aws_s3_bucket_name: str = "smartgriev-attachments"
+    aws_region: str = "us-east-1"
+    
+    # Google Cloud
+    google_cloud_project_id: Optional[str] = None
+    google_cloud_storage_bucket: str = "smartgriev-attachments"
+    
+    # Redis
+    redis_url: str = "redis://localhost:6379/0"
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_timeout_seconds: float = 0.5
+    auth_cache_ttl_seconds: int = 300
+    
+    # Celery
+    celery_broker_url: str = "redis://localhost:6379/0"
+    celery_result_backend: str = "redis://localhost:6379/0"
+    
+    # Business Logic
+    default_response_time_hours: int = 48
+    escalation_time_hours: int = 72
+    
+    # Logging
+    log_file: str = "logs/app.log"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading the environment only once.
+    
+    Usage:
+        @app.get("/info")
+        async def info(settings: Settings = Depends(get_settings)):
+            return {"version": settings.app_version}
+    """
+    return Settings()
 
 
 # Create global settings instance
-settings = Settings()
+settings = get_settings()
@@ -2,21 +2,39 @@
 
 import logging
 import logging.handlers
+import queue
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from .config import settings
 
-# Create logs directory if it doesn't exist
-log_dir = Path(settings.log_file).parent
-log_dir.mkdir(parents=True, exist_ok=True)
+# Directory for the log file, created on first setup_logging() call
+_LOG_DIR = Path(settings.log_file).parent
+
+# Background thread that writes queued records to the real handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
 
 
 def setup_logging():
-    """Configure application logging"""
+    """
+    Configure application logging.
+    
+    Loggers only enqueue records; a QueueListener thread formats them and
+    does the file/console IO, so request handlers never wait on the file
+    handler's lock or on log rotation. Safe to call more than once.
+    """
+    global _listener, _queue_handler
     
     # Root logger
     root_logger = logging.getLogger()
+    if _listener is not None:
+        return root_logger
     root_logger.setLevel(settings.log_level)
     
+    if not _LOG_DIR.exists():
+        _LOG_DIR.mkdir(parents=True, exist_ok=True)
+    
     # Log format
     log_format = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -31,22 +49,37 @@ def setup_logging():
     )
     file_handler.setLevel(settings.log_level)
     file_handler.setFormatter(log_format)
-    root_logger.addHandler(file_handler)
+    handlers = [file_handler]
     
     # Console handler for development
     if settings.debug:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(log_format)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
     
     return root_logger
 
 
-# Create logger instance
-logger = setup_logging()
+def stop_logging():
+    """Flush queued log records and stop the listener thread"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Get a logger instance for a module"""
+    """Get a logger instance for a module (cached, names are bounded by module count)"""
     return logging.getLogger(name)
@@ -0,0 +1,33 @@
+"""Response classes shared by the API"""
+
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Naive datetimes are left without an offset so the output matches what
+# pydantic produces for responses that go through response_model.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types orjson doesn't know natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class AppJSONResponse(ORJSONResponse):
+    """
+    orjson response that also accepts pydantic models as content.
+    
+    Returning a schema wrapped in this class skips FastAPI's jsonable_encoder
+    pass. Models are serialized by pydantic-core straight to JSON bytes;
+    anything else goes through orjson, which encodes UUID and datetime
+    values natively.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
@@ -1,23 +1,129 @@
 """Security utilities for authentication and encryption"""
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional, Dict, Any, Callable, TypeVar
 import jwt
-from passlib.context import CryptContext
 from .config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Token lifetimes and signing parameters are fixed for the life of the process
+_ACCESS_SECONDS = timedelta(minutes=settings.access_token_expire_minutes).total_seconds()
+_REFRESH_SECONDS = timedelta(days=settings.refresh_token_expire_days).total_seconds()
+_SECRET = settings.secret_key
+_ALG = settings.algorithm
+_ALGORITHMS = [_ALG]
+
+
+T = TypeVar("T")
+
+
+# Prefix of hashes written by the argon2 hasher; anything else is legacy
+_ARGON2_PREFIX = "$argon2"
+
+
+@lru_cache(maxsize=1)
+def _argon2_hasher():
+    """
+    Build the argon2 hasher on first use.
+    
+    argon2-cffi is called directly rather than through passlib, so hashing
+    and verifying go straight into the C implementation without passlib's
+    scheme detection and option parsing on every call.
+    """
+    from argon2 import PasswordHasher
+    return PasswordHasher(
+        time_cost=settings.argon2_time_cost,
+        memory_cost=settings.argon2_memory_cost,
+        parallelism=settings.argon2_parallelism,
+    )
+
+
+@lru_cache(maxsize=1)
+def _legacy_pwd_context():
+    """
+    Build the passlib context for hashes created before the switch to argon2.
+    
+    Only imported when a pbkdf2_sha256 hash has to be verified.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256"])
+
+
+@lru_cache(maxsize=1)
+def _hash_executor() -> ThreadPoolExecutor:
+    """
+    Build the thread pool reserved for password hashing.
+    
+    argon2 releases the GIL while it hashes, so threads run in parallel on
+    separate cores. Keeping them out of the default executor stops a burst of
+    logins from queueing every other to_thread call behind it, and the worker
+    cap bounds the memory argon2 allocates per concurrent hash.
+    """
+    return ThreadPoolExecutor(
+        max_workers=max(1, settings.password_hash_workers),
+        thread_name_prefix="password-hash",
+    )
+
+
+async def run_in_hash_pool(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a CPU-bound hashing call on the hashing pool without blocking the event loop.
+    
+    Args:
+        func: Function to call
+        *args: Positional arguments for func
+    
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor(), func, *args)
+
+
+def shutdown_hash_pool():
+    """Stop the hashing pool; a later call to run_in_hash_pool starts a new one"""
+    if _hash_executor.cache_info().currsize:
+        _hash_executor().shutdown(wait=False)
+        _hash_executor.cache_clear()
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    """Hash a password using argon2"""
+    return _argon2_hasher().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        from argon2.exceptions import VerificationError, InvalidHashError
+        try:
+            return _argon2_hasher().verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return _legacy_pwd_context().verify(plain_password, hashed_password)
+    except ValueError:
+        return False
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool"""
+    return await run_in_hash_pool(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash on the hashing pool"""
+    return await run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash uses an old scheme or outdated cost settings"""
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    return _argon2_hasher().check_needs_rehash(hashed_password)
 
 
 def create_access_token(
@@ -39,21 +145,15 @@ def create_access_token(
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = expires_delta.total_seconds()
+    elif token_type == "refresh":
+        lifetime = _REFRESH_SECONDS
     else:
-        if token_type == "refresh":
-            expire = datetime.utcnow() + timedelta(
-                days=settings.refresh_token_expire_days
-            )
-        else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.access_token_expire_minutes
-            )
+        lifetime = _ACCESS_SECONDS
     
-    to_encode.update({"exp": expire, "type": token_type})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
+    # JWT "exp" is a NumericDate, so plain epoch seconds are enough
+    to_encode.update({"exp": int(time.time() + lifetime), "type": token_type})
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALG)
     return encoded_jwt
 
 
@@ -69,9 +169,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
         Decoded token claims or None if invalid
     """
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        payload = jwt.decode(token, _SECRET, algorithms=_ALGORITHMS)
         
         # Verify token type
         if payload.get("type") != token_type:
@@ -87,9 +185,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode token without type verification"""
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        payload = jwt.decode(token, _SECRET, algorithms=_ALGORITHMS)
         return payload
     except jwt.ExpiredSignatureError:
         return None
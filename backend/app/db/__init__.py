@@ -1,6 +1,6 @@
 """Database initialization and session management"""
 
-from .session import SessionLocal, engine
+from .session import AsyncSessionLocal, engine
 from .base import Base
 
-__all__ = ["SessionLocal", "engine", "Base"]
+__all__ = ["AsyncSessionLocal", "engine", "Base"]
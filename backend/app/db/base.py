@@ -1,11 +1,25 @@
 """Database base configuration"""
 
+import app.models as models
 from app.models.base import Base
-from app.models.user import User
-from app.models.grievance import Grievance
-from app.models.timeline_event import TimelineEvent
-from app.models.attachment import Attachment
-from app.models.department import Department
-
-# Make all models available for migrations
-__all__ = ["Base", "User", "Grievance", "TimelineEvent", "Attachment", "Department"]
+
+# The model list lives in app.models; this module only re-exports it
+__all__ = ["Base", "import_all_models", *models.__all__]
+
+
+def import_all_models() -> None:
+    """
+    Import every model module so their tables are registered on Base.metadata.
+    
+    Only needed by code that works with the full schema (create_all, migrations);
+    everything else imports the models it uses.
+    """
+    for name in models.__all__:
+        getattr(models, name)
+
+
+def __getattr__(name: str):
+    # Models are resolved lazily (PEP 562) through app.models
+    if name in models.__all__:
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,23 @@
 """FastAPI application entry point"""
 
+import asyncio
 import logging
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.logging import setup_logging
-from app.db.session import init_db
+from app.core.cache import close_redis
+from app.core.responses import AppJSONResponse
+from app.core.security import run_in_hash_pool, shutdown_hash_pool
+from app.core.logging import setup_logging, stop_logging
+from app.db.session import engine, init_db
 from app.api.v1 import api_router
+from app.services.ai_batcher import AIBatcher
+from app.services.ai_service import get_ai_service
+from app.services.auth_service import warm_password_hashing
 
 # Setup logging
 logger = setup_logging()
@@ -19,9 +27,23 @@ logger = setup_logging()
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
     # Startup
+    setup_logging()  # no-op unless a previous shutdown stopped logging
     logger.info("Starting Smart Griev API...")
     try:
-        init_db()  # Database initialization - enabled
+        await init_db()  # Database initialization - enabled
+        
+        # Start the hashing pool and precompute the dummy hash before the first login
+        await run_in_hash_pool(warm_password_hashing)
+        
+        # Load the AI service once per process and share it via app.state
+        app.state.ai_service = get_ai_service()
+        await asyncio.to_thread(app.state.ai_service.warmup)
+        app.state.ai_queue = AIBatcher(
+            app.state.ai_service,
+            max_batch=settings.ai_batch_size,
+            max_wait_ms=settings.ai_batch_wait_ms
+        )
+        app.state.ai_queue.start()
         logger.info("Smart Griev API initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize: {e}")
@@ -30,6 +52,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Smart Griev API...")
+    if getattr(app.state, "ai_queue", None) is not None:
+        await app.state.ai_queue.stop()
+    await close_redis()
+    await engine.dispose()
+    shutdown_hash_pool()
+    stop_logging()
 
 
 # Create FastAPI app
@@ -38,6 +66,7 @@ app = FastAPI(
     description="AI-Powered Grievance Management System",
     version=settings.app_version,
     lifespan=lifespan,
+    default_response_class=AppJSONResponse,
     docs_url="/docs",
     openapi_url="/openapi.json",
 )
@@ -63,14 +92,18 @@ app.mount("/static/uploads", StaticFiles(directory="uploads"), name="static")
 
 
 # Error handlers
+# The 500 body never changes, so encode it once
+_ISE_BODY = orjson.dumps({
+    "detail": "Internal server error",
+    "type": "internal_server_error"
+})
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return {
-        "detail": "Internal server error",
-        "type": "internal_server_error"
-    }
+    return Response(content=_ISE_BODY, status_code=500, media_type="application/json")
 
 
 if __name__ == "__main__":
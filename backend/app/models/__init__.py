@@ -1,9 +1,28 @@
 """Database models and ORM definitions"""
 
-from .user import User
-from .grievance import Grievance
-from .timeline_event import TimelineEvent
-from .attachment import Attachment
-from .department import Department
+from importlib import import_module
+
+# Models are imported on first access (PEP 562) so that importing one of
+# them doesn't construct the tables of all the others.
+_MODEL_MODULES = {
+    "User": ".user",
+    "Grievance": ".grievance",
+    "TimelineEvent": ".timeline_event",
+    "Attachment": ".attachment",
+    "Department": ".department",
+}
 
 __all__ = ["User", "Grievance", "TimelineEvent", "Attachment", "Department"]
+
+
+def __getattr__(name: str):
+    module = _MODEL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,10 +2,9 @@
 
 from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
 from datetime import datetime
 
-from .base import Base
+from .base import Base, uuid7
 
 
 class Attachment(Base):
@@ -25,7 +24,7 @@ class Attachment(Base):
     
     __tablename__ = "attachments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     grievance_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
     file_name = Column(String(255), nullable=False)
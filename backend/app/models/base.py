@@ -1,5 +1,64 @@
 """Base model for all SQLAlchemy models"""
 
+import os
+import time
+import uuid
+from enum import Enum as PyEnum
+from typing import Optional, Type
+from sqlalchemy import SmallInteger
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+    
+    The top 48 bits hold the Unix time in milliseconds, so keys created one
+    after another land next to each other in the primary key index instead of
+    at random pages like uuid4.
+    
+    Returns:
+        New UUID
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big")
+    # Set the version (7) and variant (RFC 4122) bits
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+class SmallEnum(TypeDecorator):
+    """
+    Store a Python enum as a SMALLINT holding the member's position.
+    
+    Columns stay two bytes wide and compare as integers, while the ORM keeps
+    working with enum members. Members are numbered in declaration order, so
+    new members must only ever be appended to the enum.
+    """
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class: Type[PyEnum], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+    
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_class):
+            value = self.enum_class(value)
+        return self._codes[value]
+    
+    def process_result_value(self, value, dialect) -> Optional[PyEnum]:
+        if value is None:
+            return None
+        return self._members[value]
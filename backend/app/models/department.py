@@ -1,11 +1,10 @@
 """Department model for organizing grievance handling"""
 
-from sqlalchemy import Column, String, Text, DateTime, Integer
+from sqlalchemy import Column, String, Text, DateTime, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
 from datetime import datetime
 
-from .base import Base
+from .base import Base, uuid7
 
 
 class Department(Base):
@@ -29,7 +28,7 @@ class Department(Base):
     
     __tablename__ = "departments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     name = Column(String(255), nullable=False, unique=True)
     code = Column(String(50), nullable=False, unique=True, index=True)
@@ -51,5 +50,17 @@ class Department(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Only departments with spare capacity, in load order, so routing's
+        # "least loaded department with room" lookups skip full departments
+        # and need no sort
+        Index(
+            'idx_department_available',
+            'code', 'current_load',
+            postgresql_where=text('current_load < max_capacity'),
+            sqlite_where=text('current_load < max_capacity')
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<Department(id={self.id}, name={self.name}, code={self.code})>"
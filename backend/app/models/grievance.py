@@ -1,12 +1,12 @@
 """Grievance model for tracking citizen complaints"""
 
-from sqlalchemy import Column, String, Enum, DateTime, Integer, Float, Text, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Integer, Float, Text, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from .base import Base
+from .base import Base, SmallEnum, uuid7
 
 
 class GrievanceCategory(PyEnum):
@@ -69,10 +69,10 @@ class Grievance(Base):
     
     __tablename__ = "grievances"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    citizen_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    officer_id = Column(UUID(as_uuid=True), nullable=True, index=True)
-    department_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    citizen_id = Column(UUID(as_uuid=True), nullable=False)
+    officer_id = Column(UUID(as_uuid=True), nullable=True)
+    department_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Content
     title = Column(String(255), nullable=False)
@@ -81,24 +81,24 @@ class Grievance(Base):
     
     # AI Analysis
     category = Column(
-        Enum(GrievanceCategory),
+        SmallEnum(GrievanceCategory),
         nullable=False,
         index=True
     )
     urgency = Column(
-        Enum(GrievanceUrgency),
+        SmallEnum(GrievanceUrgency),
         nullable=False,
         index=True
     )
-    is_duplicate = Column(Boolean, default=False, index=True)
-    duplicate_of_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    is_duplicate = Column(Boolean, default=False)
+    duplicate_of_id = Column(UUID(as_uuid=True), nullable=True)
     similarity_score = Column(Float, nullable=True)  # 0.0 - 1.0
     ai_confidence = Column(Float, nullable=False)  # 0.0 - 1.0
     priority_score = Column(Float, nullable=False, default=0.5)  # 0.0 - 1.0
     
     # Status tracking
     status = Column(
-        Enum(GrievanceStatus),
+        SmallEnum(GrievanceStatus),
         nullable=False,
         default=GrievanceStatus.SUBMITTED,
         index=True
@@ -107,15 +107,55 @@ class Grievance(Base):
     # Timeline
     assigned_at = Column(DateTime, nullable=True)
     resolved_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Indexes for common queries
+    # Relationships (no FK constraints, so the join condition is explicit)
+    citizen = relationship(
+        "User",
+        primaryjoin="foreign(Grievance.citizen_id) == User.id",
+        viewonly=True
+    )
+    department = relationship(
+        "Department",
+        primaryjoin="foreign(Grievance.department_id) == Department.id",
+        viewonly=True
+    )
+    # Only populated when eager-loaded (selectinload), never lazily
+    attachments = relationship(
+        "Attachment",
+        primaryjoin="foreign(Attachment.grievance_id) == Grievance.id",
+        order_by="Attachment.uploaded_at",
+        lazy="noload",
+        viewonly=True
+    )
+    
+    # Indexes for common queries. The composites also serve lookups on their
+    # leading column, so citizen/officer/department ids aren't indexed alone.
     __table_args__ = (
-        Index('idx_citizen_status', 'citizen_id', 'status'),
-        Index('idx_officer_status', 'officer_id', 'status'),
+        # Listing indexes end in the listing sort order, so pages with and
+        # without a status filter are both index range scans with no sort
+        Index('idx_citizen_created', citizen_id, created_at.desc(), id.desc()),
+        Index(
+            'idx_citizen_status',
+            citizen_id, status, created_at.desc(), id.desc()
+        ),
+        Index(
+            'idx_officer_priority',
+            officer_id, priority_score.desc(), created_at.desc(), id.desc()
+        ),
+        Index(
+            'idx_officer_status',
+            officer_id, status, priority_score.desc(), created_at.desc(), id.desc()
+        ),
         Index('idx_department_status', 'department_id', 'status'),
         Index('idx_created_date', 'created_at'),
+        Index(
+            'idx_duplicates',
+            'duplicate_of_id',
+            postgresql_where=text('is_duplicate = true'),
+            sqlite_where=text('is_duplicate = 1')
+        ),
     )
     
     def __repr__(self) -> str:
@@ -1,12 +1,11 @@
 """Timeline event model for tracking grievance workflow history"""
 
-from sqlalchemy import Column, String, Enum, DateTime, Text, ForeignKey, Index, Boolean
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index, Boolean, JSON
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from .base import Base
+from .base import Base, SmallEnum, uuid7
 
 
 class EventType(PyEnum):
@@ -34,23 +33,24 @@ class TimelineEvent(Base):
         actor_role: Role of the actor
         description: Event description
         comment: Optional comment text
-        metadata: Additional event data (JSON)
+        event_metadata: Additional event data (JSON)
         is_visible_to_citizen: Whether citizen can see this event
         created_at: Event timestamp
     """
     
     __tablename__ = "timeline_events"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     grievance_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
-    event_type = Column(Enum(EventType), nullable=False, index=True)
+    event_type = Column(SmallEnum(EventType), nullable=False, index=True)
     actor_id = Column(UUID(as_uuid=True), nullable=False)
     actor_role = Column(String(50), nullable=False)  # citizen, officer, admin, system
     
     description = Column(String(255), nullable=False)
     comment = Column(Text, nullable=True)
-    event_metadata = Column(Text, nullable=True)  # JSON string for extensibility
+    # JSONB on PostgreSQL so the driver decodes it straight into a dict
+    event_metadata = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     
     is_visible_to_citizen = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
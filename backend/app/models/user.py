@@ -2,11 +2,10 @@
 
 from sqlalchemy import Column, String, Enum, DateTime, Boolean
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from .base import Base
+from .base import Base, uuid7
 
 
 class UserRole(PyEnum):
@@ -36,7 +35,7 @@ class User(Base):
     
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=False)
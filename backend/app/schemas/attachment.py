@@ -1,7 +1,8 @@
 """Attachment schemas"""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from uuid import UUID
 
 
 class AttachmentCreate(BaseModel):
@@ -13,14 +14,18 @@ class AttachmentCreate(BaseModel):
 
 class AttachmentResponse(BaseModel):
     """Schema for attachment response"""
-    id: str
-    grievance_id: str
+    id: UUID
+    grievance_id: UUID
     file_name: str
     file_size: int
     file_type: str
     file_url: str
-    uploaded_by: str
+    uploaded_by: UUID
     uploaded_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True
+    )
@@ -1,8 +1,9 @@
 """Grievance schemas for request/response validation"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 
@@ -54,21 +55,34 @@ class GrievanceUpdate(BaseModel):
 
 class AttachmentInfo(BaseModel):
     """Schema for attachment information"""
-    id: str
+    id: UUID
     file_name: str
     file_size: int
     file_type: str
     file_url: str
-    uploaded_by: str
+    uploaded_by: UUID
     uploaded_at: datetime
+    
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True
+    )
 
 
 class GrievanceResponse(BaseModel):
-    """Schema for grievance response"""
-    id: str
-    citizen_id: str
-    officer_id: Optional[str] = None
-    department_id: str
+    """
+    Schema for grievance response.
+    
+    attachments is read from Grievance.attachments, which is never lazy
+    loaded: queries feeding this schema must use
+    selectinload(Grievance.attachments), otherwise the list is empty.
+    """
+    id: UUID
+    citizen_id: UUID
+    officer_id: Optional[UUID] = None
+    department_id: UUID
     
     title: str
     description: str
@@ -79,7 +93,7 @@ class GrievanceResponse(BaseModel):
     status: GrievanceStatus
     
     is_duplicate: bool
-    duplicate_of_id: Optional[str] = None
+    duplicate_of_id: Optional[UUID] = None
     similarity_score: Optional[float] = None
     ai_confidence: float
     priority_score: float
@@ -91,8 +105,12 @@ class GrievanceResponse(BaseModel):
     
     attachments: Optional[List[AttachmentInfo]] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True
+    )
 
 
 class GrievanceListResponse(BaseModel):
@@ -101,6 +119,14 @@ class GrievanceListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+# Validates whole result lists (ORM objects or rows) in one pydantic-core call
+GRIEVANCE_LIST_ADAPTER = TypeAdapter(List[GrievanceResponse])
 
 
 class AIAnalysisResult(BaseModel):
@@ -1,8 +1,9 @@
 """Timeline event schemas"""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 
@@ -29,18 +30,26 @@ class TimelineEventCreate(BaseModel):
 
 class TimelineEventResponse(BaseModel):
     """Schema for timeline event response"""
-    id: str
-    grievance_id: str
+    id: UUID
+    grievance_id: UUID
     event_type: EventType
-    actor_id: str
+    actor_id: UUID
     actor_role: str
     description: str
     comment: Optional[str] = None
     is_visible_to_citizen: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True
+    )
+
+
+# Validates a whole timeline from ORM objects in one pydantic-core call
+TIMELINE_EVENT_LIST_ADAPTER = TypeAdapter(list[TimelineEventResponse])
 
 
 class GrievanceTimelineResponse(BaseModel):
@@ -48,3 +57,5 @@ class GrievanceTimelineResponse(BaseModel):
     grievance_id: str
     events: list[TimelineEventResponse]
     total_events: int
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
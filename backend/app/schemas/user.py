@@ -1,8 +1,9 @@
 """User schemas for request/response validation"""
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 
@@ -30,18 +31,22 @@ class UserLogin(BaseModel):
 
 class UserResponse(BaseModel):
     """Schema for user response"""
-    id: str
+    id: UUID
     email: str
     full_name: str
     role: UserRole
     phone: Optional[str] = None
-    department_id: Optional[str] = None
+    department_id: Optional[UUID] = None
     is_active: bool
     is_verified: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True
+    )
 
 
 class TokenResponse(BaseModel):
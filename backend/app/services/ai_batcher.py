@@ -0,0 +1,122 @@
+"""Micro-batching queue for AI grievance analysis"""
+
+import asyncio
+from contextlib import suppress
+from typing import Dict, List, Optional, Tuple
+from app.core.logging import get_logger
+from app.services.ai_service import AIService
+
+logger = get_logger(__name__)
+
+
+class AIBatcher:
+    """Coalesces concurrent analysis requests into batched AIService calls"""
+
+    def __init__(
+        self,
+        ai_service: AIService,
+        max_batch: int = 8,
+        max_wait_ms: int = 20
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            ai_service: Service used to analyze each batch
+            max_batch: Maximum number of requests per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+        """
+        self.ai_service = ai_service
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Requests taken off the queue whose batch hasn't been answered yet
+        self._in_flight: List[Tuple] = []
+
+    def start(self):
+        """Start the background worker on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            "AI batcher started (max_batch=%d, max_wait=%.0fms)",
+            self.max_batch, self.max_wait * 1000
+        )
+
+    async def stop(self):
+        """Stop the background worker and fail any in-flight or queued requests"""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+
+        pending = self._in_flight
+        self._in_flight = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("AI batcher stopped"))
+
+    async def submit(
+        self,
+        text: str,
+        existing_grievances: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Queue a grievance for analysis and wait for its result.
+
+        Falls back to a direct call when the worker is not running.
+        Analysis always runs in a worker thread so the event loop keeps
+        serving other requests.
+        """
+        if self._worker is None:
+            return await asyncio.to_thread(
+                self.ai_service.analyze_grievance, text, existing_grievances
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, existing_grievances, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple]:
+        """Wait for one request, then collect more until the batch is full or times out"""
+        loop = asyncio.get_running_loop()
+        # Collected straight into _in_flight so stop() can fail a partial batch
+        batch = self._in_flight = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Worker loop draining the queue in batches"""
+        while True:
+            batch = await self._next_batch()
+            items = [(text, existing) for text, existing, _ in batch]
+
+            try:
+                results = await asyncio.to_thread(self.ai_service.analyze_batch, items)
+            except Exception as e:
+                logger.error("Error analyzing grievance batch: %s", e)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+            self._in_flight = []
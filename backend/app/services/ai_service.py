@@ -1,15 +1,19 @@
 """AI/NLP service for grievance analysis and classification"""
 
+import re
+from operator import itemgetter
+from enum import Enum as PyEnum
 from typing import Optional, List, Dict, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
 from app.core.logging import get_logger
 from app.core.config import settings
 from app.models.grievance import GrievanceCategory, GrievanceUrgency
 
 logger = get_logger(__name__)
 
+# Words used for keyword matching
+_WORD_RE = re.compile(r"[a-z]+")
+
 
 class AIService:
     """Service for AI-powered grievance analysis"""
@@ -74,91 +78,187 @@ class AIService:
         ],
     }
     
+    # Keyword list sizes used to normalize category confidence
+    CATEGORY_KEYWORD_COUNTS = {
+        category: len(keywords) for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    
+    # Base priority by (urgency, is_duplicate); duplicates get half weight
+    PRIORITY_TABLE = {
+        (GrievanceUrgency.CRITICAL, False): 1.0,
+        (GrievanceUrgency.CRITICAL, True): 0.5,
+        (GrievanceUrgency.HIGH, False): 0.75,
+        (GrievanceUrgency.HIGH, True): 0.375,
+        (GrievanceUrgency.MEDIUM, False): 0.5,
+        (GrievanceUrgency.MEDIUM, True): 0.25,
+        (GrievanceUrgency.LOW, False): 0.25,
+        (GrievanceUrgency.LOW, True): 0.125,
+    }
+    
     def __init__(self):
         """Initialize AI service"""
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=1000,
-            min_df=settings.tf_idf_min_df,
-            max_df=settings.tf_idf_max_df,
-            stop_words='english'
-        )
+        # Each duplicate check fits its own vectorizer with these settings,
+        # so concurrent analyses share no mutable state
+        self.tfidf_params = {
+            "max_features": 1000,
+            "min_df": settings.tf_idf_min_df,
+            "max_df": settings.tf_idf_max_df,
+            "stop_words": "english",
+        }
         self.similarity_threshold = settings.similarity_threshold
-        logger.info(f"AIService initialized with model: {settings.nlp_model}")
+        
+        self._build_keyword_index()
+        logger.info("AIService initialized with model: %s", settings.nlp_model)
     
-    def classify_grievance(
+    def warmup(self):
+        """
+        Run one throwaway analysis so the first real request does not pay
+        for lazy imports and first-call setup in the NLP stack.
+        """
+        self.analyze_grievance(
+            "No water supply in our street since yesterday",
+            [{"id": "warmup", "text": "Water pipeline leaking near the park", "status": "submitted"}]
+        )
+        logger.info("AIService warmed up")
+    
+    def _best_match(self, text: str, candidate_texts: List[str]) -> Tuple[int, float]:
+        """
+        Find the candidate most similar to text.
+        
+        The vocabulary and IDF weights are fitted on the text together with
+        its own candidates, so every citizen's check sees the same weights
+        it would in isolation.
+        
+        Returns:
+            Tuple of (candidate index, cosine similarity)
+        """
+        matrix = TfidfVectorizer(**self.tfidf_params).fit_transform([text] + candidate_texts)
+        
+        # TfidfVectorizer rows are L2-normalized, so cosine similarity is a dot product
+        similarities = (matrix[1:] @ matrix[0].T).toarray().ravel()
+        best_idx = int(similarities.argmax())
+        return best_idx, float(similarities[best_idx])
+    
+    def _build_keyword_index(self):
+        """
+        Index every category and urgency keyword with what it scores for.
+        
+        Single-word keywords are matched against the text's word set, so
+        "water" no longer hits "underwater"; multi-word phrases still use a
+        substring check. Keywords shared between lists are looked up once.
+        """
+        tags: Dict[str, List[Tuple[str, PyEnum]]] = {}
+        for category, keywords in self.CATEGORY_KEYWORDS.items():
+            for keyword in keywords:
+                tags.setdefault(keyword, []).append(("cat", category))
+        for urgency, keywords in self.URGENCY_KEYWORDS.items():
+            for keyword in keywords:
+                tags.setdefault(keyword, []).append(("urg", urgency))
+        self._keyword_tags = tags
+        self._keyword_tokens = frozenset(k for k in tags if _WORD_RE.fullmatch(k))
+        self._keyword_phrases = tuple(k for k in tags if k not in self._keyword_tokens)
+    
+    def _score_keywords(
         self,
         text: str
-    ) -> Tuple[GrievanceCategory, float]:
+    ) -> Tuple[Dict[GrievanceCategory, int], Dict[GrievanceUrgency, int]]:
         """
-        Classify grievance into a category using keyword matching and scoring.
+        Count matching keywords per category and urgency in a single pass.
         
         Args:
             text: Grievance description text
             
         Returns:
-            Tuple of (category, confidence_score)
+            Tuple of (category_scores, urgency_scores)
         """
         text_lower = text.lower()
-        category_scores = {}
+        words = set(_WORD_RE.findall(text_lower))
+        # Plain plurals ("potholes", "schools") still count for their keyword
+        words.update([word[:-1] for word in words if word.endswith("s")])
+        found = words & self._keyword_tokens
+        found.update(p for p in self._keyword_phrases if p in text_lower)
         
-        # Calculate scores for each category
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            category_scores[category] = score
+        scores = {
+            "cat": dict.fromkeys(self.CATEGORY_KEYWORDS, 0),
+            "urg": dict.fromkeys(self.URGENCY_KEYWORDS, 0),
+        }
+        for keyword in found:
+            for kind, label in self._keyword_tags[keyword]:
+                scores[kind][label] += 1
         
-        # Find category with highest score
-        if max(category_scores.values()) == 0:
+        return scores["cat"], scores["urg"]
+    
+    def _pick_category(
+        self,
+        category_scores: Dict[GrievanceCategory, int]
+    ) -> Tuple[GrievanceCategory, float]:
+        """Pick the best scoring category and its confidence"""
+        # Find category with highest score in a single pass
+        best_category, max_score = max(category_scores.items(), key=itemgetter(1))
+        if max_score == 0:
             # If no matches, default to OTHER
             return GrievanceCategory.OTHER, 0.3
         
-        best_category = max(category_scores, key=category_scores.get)
-        max_score = category_scores[best_category]
-        
         # Normalize confidence (0-1)
-        confidence = min(max_score / len(self.CATEGORY_KEYWORDS[best_category]), 1.0)
+        confidence = min(max_score / self.CATEGORY_KEYWORD_COUNTS[best_category], 1.0)
         
-        logger.info(f"Classified grievance as {best_category} with confidence {confidence}")
+        logger.debug("Classified grievance as %s with confidence %.3f", best_category, confidence)
         return best_category, confidence
     
-    def detect_urgency(
+    def _pick_urgency(
         self,
-        text: str
+        keyword_scores: Dict[GrievanceUrgency, int]
     ) -> Tuple[GrievanceUrgency, float]:
-        """
-        Detect urgency level of grievance.
-        
-        Args:
-            text: Grievance description text
-            
-        Returns:
-            Tuple of (urgency_level, confidence_score)
-        """
-        text_lower = text.lower()
+        """Pick the best scoring urgency level and its confidence"""
         urgency_scores = {
             GrievanceUrgency.CRITICAL: 0,
             GrievanceUrgency.HIGH: 0,
             GrievanceUrgency.MEDIUM: 0,
             GrievanceUrgency.LOW: 1,  # Default
         }
+        urgency_scores.update(keyword_scores)
         
-        # Calculate scores for each urgency level
-        for urgency, keywords in self.URGENCY_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            urgency_scores[urgency] = score
-        
-        # Find urgency level with highest score
-        best_urgency = max(urgency_scores, key=urgency_scores.get)
-        max_score = urgency_scores[best_urgency]
+        # Find urgency level with highest score in a single pass
+        best_urgency, max_score = max(urgency_scores.items(), key=itemgetter(1))
         
         # Normalize confidence
-        total_urgency_keywords = sum(
-            len(keywords) for keywords in self.URGENCY_KEYWORDS.values()
-        )
         confidence = min(max_score / 3, 1.0) if max_score > 0 else 0.5
         
-        logger.info(f"Detected urgency as {best_urgency} with confidence {confidence}")
+        logger.debug("Detected urgency as %s with confidence %.3f", best_urgency, confidence)
         return best_urgency, confidence
     
+    def classify_grievance(
+        self,
+        text: str
+    ) -> Tuple[GrievanceCategory, float]:
+        """
+        Classify grievance into a category using keyword matching and scoring.
+        
+        Args:
+            text: Grievance description text
+            
+        Returns:
+            Tuple of (category, confidence_score)
+        """
+        category_scores, _ = self._score_keywords(text)
+        return self._pick_category(category_scores)
+    
+    def detect_urgency(
+        self,
+        text: str
+    ) -> Tuple[GrievanceUrgency, float]:
+        """
+        Detect urgency level of grievance.
+        
+        Args:
+            text: Grievance description text
+            
+        Returns:
+            Tuple of (urgency_level, confidence_score)
+        """
+        _, urgency_scores = self._score_keywords(text)
+        return self._pick_urgency(urgency_scores)
+    
     def detect_duplicates(
         self,
         grievance_text: str,
@@ -180,40 +280,50 @@ class AIService:
                 "duplicate_text": "..."
             }
         """
-        if not existing_grievances:
-            return None
+        return self.detect_duplicates_batch([grievance_text], existing_grievances)[0]
+    
+    def detect_duplicates_batch(
+        self,
+        texts: List[str],
+        existing_grievances: List[Dict]
+    ) -> List[Optional[Dict]]:
+        """
+        Detect duplicates for several new grievances against the same candidates.
         
-        try:
-            # Prepare texts for vectorization
-            texts = [grievance_text] + [g["text"] for g in existing_grievances]
-            
-            # Calculate TF-IDF vectors
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
-            
-            # Calculate similarity between new grievance and all existing ones
-            similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+        Args:
+            texts: New grievance texts
+            existing_grievances: List of existing grievance texts and IDs
+                [{"id": "...", "text": "...", "status": "..."}, ...]
             
-            # Find the most similar grievance
-            max_similarity_idx = np.argmax(similarities)
-            max_similarity = similarities[max_similarity_idx]
+        Returns:
+            Duplicate info (see detect_duplicates) or None, in the same order as texts
+        """
+        if not texts or not existing_grievances:
+            return [None] * len(texts)
+        
+        candidate_texts = [g["text"] for g in existing_grievances]
+        results = []
+        for text in texts:
+            try:
+                best_idx, max_similarity = self._best_match(text, candidate_texts)
+            except Exception as e:
+                logger.error("Error detecting duplicates: %s", e)
+                results.append(None)
+                continue
             
             # Check if similarity exceeds threshold
             if max_similarity >= self.similarity_threshold:
-                most_similar = existing_grievances[max_similarity_idx]
-                result = {
+                most_similar = existing_grievances[best_idx]
+                results.append({
                     "duplicate_of_id": most_similar["id"],
-                    "similarity_score": float(max_similarity),
+                    "similarity_score": max_similarity,
                     "duplicate_text": most_similar["text"],
                     "duplicate_status": most_similar.get("status", "unknown")
-                }
-                logger.info(f"Found potential duplicate with similarity {max_similarity}")
-                return result
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error detecting duplicates: {e}")
-            return None
+                })
+                logger.info("Found potential duplicate with similarity %.3f", max_similarity)
+            else:
+                results.append(None)
+        return results
     
     def calculate_priority_score(
         self,
@@ -234,27 +344,10 @@ class AIService:
         Returns:
             Priority score (0.0 = lowest, 1.0 = highest)
         """
-        # Base score from urgency
-        urgency_scores = {
-            GrievanceUrgency.CRITICAL: 1.0,
-            GrievanceUrgency.HIGH: 0.75,
-            GrievanceUrgency.MEDIUM: 0.5,
-            GrievanceUrgency.LOW: 0.25,
-        }
-        
-        score = urgency_scores[urgency]
-        
-        # Reduce score for duplicates
-        if is_duplicate:
-            score *= 0.5
+        # Table values and confidence are both within [0, 1], so no clamp is needed
+        score = self.PRIORITY_TABLE[urgency, is_duplicate] * ai_confidence
         
-        # Factor in AI confidence
-        score *= ai_confidence
-        
-        # Ensure score is in valid range
-        score = max(0.0, min(1.0, score))
-        
-        logger.info(f"Calculated priority score: {score}")
+        logger.debug("Calculated priority score: %.3f", score)
         return score
     
     def analyze_grievance(
@@ -272,24 +365,32 @@ class AIService:
         Returns:
             Complete analysis result
         """
-        logger.info("Starting grievance analysis")
+        logger.debug("Starting grievance analysis")
+        
+        duplicate_info = None
+        if existing_grievances:
+            duplicate_info = self.detect_duplicates(text, existing_grievances)
+        
+        return self._build_analysis(text, duplicate_info)
+    
+    def _build_analysis(
+        self,
+        text: str,
+        duplicate_info: Optional[Dict]
+    ) -> Dict:
+        """Combine keyword scoring with an already computed duplicate check"""
+        # Category and urgency keywords are matched in one pass over the text
+        category_scores, urgency_scores = self._score_keywords(text)
         
         # Classify category
-        category, category_confidence = self.classify_grievance(text)
+        category, category_confidence = self._pick_category(category_scores)
         
         # Detect urgency
-        urgency, urgency_confidence = self.detect_urgency(text)
-        
-        # Detect duplicates
-        duplicate_info = None
-        is_duplicate = False
-        similarity_score = None
+        urgency, urgency_confidence = self._pick_urgency(urgency_scores)
         
-        if existing_grievances:
-            duplicate_info = self.detect_duplicates(text, existing_grievances)
-            if duplicate_info:
-                is_duplicate = True
-                similarity_score = duplicate_info["similarity_score"]
+        # Duplicate check result
+        is_duplicate = duplicate_info is not None
+        similarity_score = duplicate_info["similarity_score"] if duplicate_info else None
         
         # Use average confidence
         avg_confidence = (category_confidence + urgency_confidence) / 2
@@ -311,5 +412,57 @@ class AIService:
             "urgency_confidence": urgency_confidence,
         }
         
-        logger.info(f"Analysis complete: {result}")
+        logger.debug("Analysis complete: %s", result)
         return result
+    
+    def analyze_batch(
+        self,
+        items: List[Tuple[str, Optional[List[Dict]]]]
+    ) -> List[Dict]:
+        """
+        Analyze a batch of grievances.
+        
+        Args:
+            items: List of (text, existing_grievances) pairs
+            
+        Returns:
+            Analysis results in the same order as items
+        """
+        logger.debug("Analyzing batch of %d grievances", len(items))
+        
+        # Requests arriving together usually share the same duplicate
+        # candidates, so check each group of them in one batched call
+        groups: Dict[Tuple, List[int]] = {}
+        for index, (_, existing_grievances) in enumerate(items):
+            if existing_grievances:
+                key = tuple(str(g["id"]) for g in existing_grievances)
+                groups.setdefault(key, []).append(index)
+        
+        duplicates: List[Optional[Dict]] = [None] * len(items)
+        for indices in groups.values():
+            found = self.detect_duplicates_batch(
+                [items[i][0] for i in indices], items[indices[0]][1]
+            )
+            for i, duplicate_info in zip(indices, found):
+                duplicates[i] = duplicate_info
+        
+        return [
+            self._build_analysis(text, duplicate_info)
+            for (text, _), duplicate_info in zip(items, duplicates)
+        ]
+
+
+_ai_service: Optional[AIService] = None
+
+
+def get_ai_service() -> AIService:
+    """
+    Get the process-wide AIService, creating it on first use.
+    
+    The service holds the TF-IDF index, so every caller in the process
+    must share one instance rather than building its own.
+    """
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
@@ -1,9 +1,14 @@
 """Authentication and authorization service"""
 
+from functools import lru_cache
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
+from uuid import UUID
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import (
-    get_password_hash, verify_password, create_access_token, verify_token
+    get_password_hash, get_password_hash_async, verify_password,
+    verify_password_async, password_needs_rehash, run_in_hash_pool,
+    create_access_token, verify_token
 )
 from app.core.logging import get_logger
 from app.models.user import User, UserRole
@@ -12,12 +17,54 @@ from app.schemas.user import UserCreate, TokenResponse
 logger = get_logger(__name__)
 
 
+def normalize_email(email: str) -> str:
+    """Normalize an email for storage and lookup"""
+    # Stored lowercased, so the unique index on users.email answers
+    # every lookup without a LOWER() scan
+    return email.strip().lower()
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash checked against when no user matches, so unknown emails cost a full verify"""
+    return get_password_hash("dummy-password-for-timing")
+
+
+def warm_password_hashing() -> None:
+    """Build the hasher and the dummy hash so the first login doesn't pay for them"""
+    _dummy_password_hash()
+
+
+def _verify_dummy_password(password: str) -> None:
+    """Spend the same hashing work as a real failed login"""
+    verify_password(password, _dummy_password_hash())
+
+
 class AuthService:
     """Service for authentication and authorization"""
     
     @staticmethod
-    def register_user(
-        db: Session,
+    async def get_user_by_email(
+        db: AsyncSession,
+        email: str
+    ) -> Optional[User]:
+        """
+        Get a user by email.
+        
+        Args:
+            db: Database session
+            email: User email
+            
+        Returns:
+            User or None
+        """
+        # Not cached: login needs the current password hash and is_active
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+    
+    @staticmethod
+    async def register_user(
+        db: AsyncSession,
         user_data: UserCreate
     ) -> Tuple[bool, str, Optional[User]]:
         """
@@ -30,20 +77,20 @@ class AuthService:
         Returns:
             Tuple of (success, message, user)
         """
+        email = normalize_email(user_data.email)
+        
         # Check if user already exists
-        existing_user = db.query(User).filter(
-            User.email == user_data.email
-        ).first()
+        existing_user = await AuthService.get_user_by_email(db, email)
         
         if existing_user:
-            logger.warning(f"Registration failed: email {user_data.email} already exists")
+            logger.warning("Registration failed: email %s already exists", email)
             return False, "Email already registered", None
         
         # Create new user
         try:
             new_user = User(
-                email=user_data.email,
-                password_hash=get_password_hash(user_data.password),
+                email=email,
+                password_hash=await get_password_hash_async(user_data.password),
                 full_name=user_data.full_name,
                 role=UserRole(user_data.role.value) if hasattr(user_data.role, 'value') else user_data.role,
                 phone=user_data.phone,
@@ -52,20 +99,20 @@ class AuthService:
             )
             
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             
-            logger.info(f"User registered successfully: {user_data.email}")
+            logger.info("User registered successfully: %s", email)
             return True, "User registered successfully", new_user
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error registering user: {e}")
+            await db.rollback()
+            logger.error("Error registering user: %s", e)
             return False, f"Registration failed: {str(e)}", None
     
     @staticmethod
-    def authenticate_user(
-        db: Session,
+    async def authenticate_user(
+        db: AsyncSession,
         email: str,
         password: str
     ) -> Tuple[bool, str, Optional[User]]:
@@ -80,21 +127,37 @@ class AuthService:
         Returns:
             Tuple of (success, message, user)
         """
-        user = db.query(User).filter(User.email == email).first()
+        email = normalize_email(email)
+        user = await AuthService.get_user_by_email(db, email)
         
         if not user:
-            logger.warning(f"Authentication failed: user {email} not found")
+            # Equalize timing with the wrong-password path
+            await run_in_hash_pool(_verify_dummy_password, password)
+            logger.warning("Authentication failed: user %s not found", email)
             return False, "Invalid credentials", None
         
         if not user.is_active:
-            logger.warning(f"Authentication failed: user {email} is inactive")
+            logger.warning("Authentication failed: user %s is inactive", email)
             return False, "Account is inactive", None
         
-        if not verify_password(password, user.password_hash):
-            logger.warning(f"Authentication failed: invalid password for {email}")
+        # Hashing is CPU-bound, so keep it off the event loop
+        if not await verify_password_async(password, user.password_hash):
+            logger.warning("Authentication failed: invalid password for %s", email)
             return False, "Invalid credentials", None
         
-        logger.info(f"User authenticated successfully: {email}")
+        # Upgrade legacy pbkdf2 hashes to argon2 while we have the plain password
+        if password_needs_rehash(user.password_hash):
+            try:
+                new_hash = await get_password_hash_async(password)
+                await db.execute(
+                    update(User).where(User.id == user.id).values(password_hash=new_hash)
+                )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error("Error upgrading password hash for %s: %s", email, e)
+        
+        logger.debug("User authenticated successfully: %s", email)
         return True, "Authentication successful", user
     
     @staticmethod
@@ -171,7 +234,7 @@ class AuthService:
             token_type="access"
         )
         
-        logger.info(f"Access token refreshed for user {payload['sub']}")
+        logger.debug("Access token refreshed for user %s", payload["sub"])
         return True, "Token refreshed", new_access_token
     
     @staticmethod
@@ -195,8 +258,8 @@ class AuthService:
         return True, "Token valid", payload
     
     @staticmethod
-    def change_password(
-        db: Session,
+    async def change_password(
+        db: AsyncSession,
         user_id: str,
         old_password: str,
         new_password: str
@@ -213,20 +276,21 @@ class AuthService:
         Returns:
             Tuple of (success, message)
         """
-        user = db.query(User).filter(User.id == user_id).first()
+        result = await db.execute(select(User).where(User.id == UUID(user_id)))
+        user = result.scalars().first()
         
         if not user:
             return False, "User not found"
         
-        if not verify_password(old_password, user.password_hash):
+        if not await verify_password_async(old_password, user.password_hash):
             return False, "Current password is incorrect"
         
         try:
-            user.password_hash = get_password_hash(new_password)
-            db.commit()
-            logger.info(f"Password changed for user {user_id}")
+            user.password_hash = await get_password_hash_async(new_password)
+            await db.commit()
+            logger.info("Password changed for user %s", user_id)
             return True, "Password changed successfully"
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error changing password: {e}")
+            await db.rollback()
+            logger.error("Error changing password: %s", e)
             return False, f"Error changing password: {str(e)}"
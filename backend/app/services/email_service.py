@@ -1,6 +1,7 @@
 
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
+from typing import Dict, List, Tuple
+from sendgrid.helpers.mail import Mail, Email, To, Content, Personalization, Substitution
 from app.core.config import settings
 from app.core.logging import get_logger
 
@@ -48,3 +49,58 @@ class EmailService:
         except Exception as e:
             logger.error(f"Error sending email: {e}")
             return False
+    
+    @staticmethod
+    def send_bulk(
+        subject: str,
+        content: str,
+        recipients: List[Tuple[str, Dict[str, str]]],
+        is_html: bool = True
+    ) -> bool:
+        """
+        Send one templated email to many recipients in a single request.
+        
+        Each recipient gets their own personalization, with substitution
+        tags in subject and content replaced by their values.
+        
+        Args:
+            subject: Email subject with substitution tags
+            content: Email body with substitution tags
+            recipients: (email, {tag: value}) pairs, at most 1000
+            is_html: Whether content is HTML
+            
+        Returns:
+            Success status
+        """
+        if not settings.sendgrid_api_key:
+            logger.warning("SendGrid API key not set. Skipping email.")
+            return False
+        
+        try:
+            sg = SendGridAPIClient(api_key=settings.sendgrid_api_key)
+            mime_type = "text/html" if is_html else "text/plain"
+            mail = Mail(
+                from_email=Email(settings.sendgrid_from_email, settings.sendgrid_from_name),
+                subject=subject,
+            )
+            mail.add_content(Content(mime_type, content))
+            
+            for to_email, substitutions in recipients:
+                personalization = Personalization()
+                personalization.add_to(To(to_email))
+                for tag, value in substitutions.items():
+                    personalization.add_substitution(Substitution(tag, value))
+                mail.add_personalization(personalization)
+            
+            response = sg.client.mail.send.post(request_body=mail.get())
+            
+            if 200 <= response.status_code < 300:
+                logger.info(f"Bulk email sent to {len(recipients)} recipients")
+                return True
+            else:
+                logger.error(f"Failed to send bulk email. Status code: {response.status_code}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Error sending bulk email: {e}")
+            return False
@@ -1,28 +1,81 @@
 """Grievance management service"""
 
-from typing import Optional, List, Dict
-from datetime import datetime
+from typing import AsyncIterator, Optional, List, Dict, Sequence, Tuple
+from datetime import datetime, timedelta
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Row, select, update, func, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from cachetools import TTLCache
 
 from app.core.logging import get_logger
+from app.models.user import UserRole
 from app.models.grievance import Grievance, GrievanceStatus, GrievanceCategory, GrievanceUrgency
 from app.models.timeline_event import TimelineEvent, EventType
 from app.models.attachment import Attachment
+from app.models.base import uuid7
 from app.schemas.grievance import GrievanceCreate
+from app.utils.pagination import encode_cursor
 
 logger = get_logger(__name__)
 
+# Statuses that still count towards escalation deadlines
+OPEN_STATUSES = (
+    GrievanceStatus.SUBMITTED,
+    GrievanceStatus.UNDER_REVIEW,
+    GrievanceStatus.IN_PROGRESS,
+    GrievanceStatus.REOPENED,
+)
+
+# Listing totals from the last five seconds, keyed by owner and filters.
+# Writes in this process drop the affected owners' totals; other workers
+# catch up when the entries expire.
+_count_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5.0)
+
+# Filter values a cached total can be keyed by, None meaning unfiltered
+_COUNT_STATUSES = (None, *GrievanceStatus)
+_COUNT_URGENCIES = (None, *GrievanceUrgency)
+
+# Columns returned by listing queries; rows are validated straight into
+# GrievanceResponse without building ORM instances
+LIST_COLUMNS = (
+    Grievance.id,
+    Grievance.citizen_id,
+    Grievance.officer_id,
+    Grievance.department_id,
+    Grievance.title,
+    Grievance.description,
+    Grievance.image_url,
+    Grievance.category,
+    Grievance.urgency,
+    Grievance.status,
+    Grievance.is_duplicate,
+    Grievance.duplicate_of_id,
+    Grievance.similarity_score,
+    Grievance.ai_confidence,
+    Grievance.priority_score,
+    Grievance.assigned_at,
+    Grievance.resolved_at,
+    Grievance.created_at,
+    Grievance.updated_at,
+)
+
+# Sort keys of the listing queries, in ORDER BY order, and the types their
+# cursor tokens decode to
+CITIZEN_SORT_KEY = (Grievance.created_at, Grievance.id)
+CITIZEN_CURSOR_TYPES = (datetime, UUID)
+OFFICER_SORT_KEY = (Grievance.priority_score, Grievance.created_at, Grievance.id)
+OFFICER_CURSOR_TYPES = (float, datetime, UUID)
+
 
 class GrievanceService:
     """Service for grievance management and tracking"""
     
     @staticmethod
-    def create_grievance(
-        db: Session,
-        citizen_id: str,
-        department_id: str,
+    async def create_grievance(
+        db: AsyncSession,
+        citizen_id: UUID,
+        department_id: UUID,
         grievance_data: GrievanceCreate,
         ai_analysis: Dict
     ) -> Optional[Grievance]:
@@ -40,10 +93,12 @@ class GrievanceService:
             Created Grievance object or None
         """
         try:
-            # Create grievance
+            # Create grievance. The ID is assigned up front so the submission
+            # event can reference it and both rows go in one commit.
             grievance = Grievance(
-                citizen_id=UUID(citizen_id),
-                department_id=UUID(department_id),
+                id=uuid7(),
+                citizen_id=citizen_id,
+                department_id=department_id,
                 title=grievance_data.title,
                 description=grievance_data.description,
                 category=ai_analysis["category"],
@@ -57,52 +112,129 @@ class GrievanceService:
             )
             
             db.add(grievance)
-            db.commit()
-            db.refresh(grievance)
             
             # Create timeline event for submission
-            GrievanceService.add_timeline_event(
+            await GrievanceService.add_timeline_event(
                 db=db,
-                grievance_id=str(grievance.id),
+                grievance_id=grievance.id,
                 event_type=EventType.SUBMITTED,
                 actor_id=citizen_id,
                 actor_role="citizen",
                 description="Grievance submitted",
-                is_visible_to_citizen=True
+                is_visible_to_citizen=True,
+                commit=False
             )
             
-            logger.info(f"Grievance created: {grievance.id}")
+            await db.commit()
+            GrievanceService._invalidate_counts(citizen_id)
+            
+            logger.info("Grievance created: %s", grievance.id)
             return grievance
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error creating grievance: {e}")
+            await db.rollback()
+            logger.error("Error creating grievance: %s", e)
             return None
     
     @staticmethod
-    def get_grievance(
-        db: Session,
-        grievance_id: str
+    async def get_grievance(
+        db: AsyncSession,
+        grievance_id: UUID
     ) -> Optional[Grievance]:
-        """Get grievance by ID"""
+        """
+        Get grievance by ID, with its citizen and department loaded in the same query.
+        
+        Any other relationship raises on access instead of lazy-loading, so a
+        caller that needs more has to add it to the eager loads here. Not
+        cached: callers check officer_id and status before writing.
+        """
         try:
-            return db.query(Grievance).filter(
-                Grievance.id == UUID(grievance_id)
-            ).first()
+            result = await db.execute(
+                select(Grievance)
+                .options(
+                    joinedload(Grievance.citizen),
+                    joinedload(Grievance.department),
+                    raiseload('*')
+                )
+                .where(Grievance.id == grievance_id)
+            )
+            return result.scalars().first()
         except Exception as e:
-            logger.error(f"Error fetching grievance: {e}")
+            logger.error("Error fetching grievance: %s", e)
             return None
     
     @staticmethod
-    def get_citizen_grievances(
-        db: Session,
-        citizen_id: str,
+    async def get_grievance_for_user(
+        db: AsyncSession,
+        grievance_id: UUID,
+        user_id: UUID,
+        role: UserRole,
+        officer_must_be_assigned: bool = True,
+        load_attachments: bool = True
+    ) -> tuple[Optional[Grievance], bool]:
+        """
+        Get a grievance together with whether the user may access it.
+        
+        The ownership check is evaluated by the database in the same
+        statement that fetches the row. Attachments are batch-loaded so
+        the grievance can be validated straight into GrievanceResponse;
+        every other relationship raises on access.
+        
+        Args:
+            db: Database session
+            grievance_id: Grievance ID
+            user_id: Requesting user's ID
+            role: Requesting user's role
+            officer_must_be_assigned: Restrict officers to grievances assigned to them
+            load_attachments: Batch-load attachments; callers that only need
+                the access check can skip the extra query
+            
+        Returns:
+            Tuple of (grievance or None if not found, access allowed)
+        """
+        if role == UserRole.CITIZEN:
+            allowed = Grievance.citizen_id == user_id
+        elif role == UserRole.OFFICER and officer_must_be_assigned:
+            allowed = Grievance.officer_id == user_id
+        else:
+            allowed = true()
+        
+        options = [raiseload('*')]
+        if load_attachments:
+            options.append(selectinload(Grievance.attachments))
+        
+        try:
+            result = await db.execute(
+                select(Grievance, allowed.label("allowed"))
+                .options(*options)
+                .where(Grievance.id == grievance_id)
+            )
+            row = result.first()
+        except Exception as e:
+            logger.error("Error fetching grievance: %s", e)
+            return None, False
+        
+        if row is None:
+            return None, False
+        return row.Grievance, bool(row.allowed)
+    
+    @staticmethod
+    async def get_citizen_grievances(
+        db: AsyncSession,
+        citizen_id: UUID,
         skip: int = 0,
         limit: int = 10,
-        status: Optional[GrievanceStatus] = None
-    ) -> tuple[List[Grievance], int]:
+        status: Optional[GrievanceStatus] = None,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> tuple[Sequence[Row], bool, Optional[str]]:
         """
-        Get all grievances for a citizen.
+        Get a page of a citizen's grievances, newest first.
+        
+        With a cursor the page starts right after the row it points at, which
+        the (citizen_id, created_at, id) index answers as a range seek. skip
+        is only used when no cursor is given. One extra row is fetched to tell
+        whether another page follows, so no COUNT runs here; see
+        get_citizen_grievance_count for totals.
         
         Args:
             db: Database session
@@ -110,40 +242,95 @@ class GrievanceService:
             skip: Number of records to skip
             limit: Number of records to return
             status: Optional status filter
+            cursor: (created_at, id) of the last row on the previous page
             
         Returns:
-            Tuple of (grievances, total_count)
+            Tuple of (grievance rows, has_more, next_cursor)
         """
         try:
-            query = db.query(Grievance).filter(
-                Grievance.citizen_id == UUID(citizen_id)
+            query = select(*LIST_COLUMNS).where(
+                Grievance.citizen_id == citizen_id
             )
             
             if status:
-                query = query.filter(Grievance.status == status)
+                query = query.where(Grievance.status == status)
             
-            total = query.count()
-            grievances = query.order_by(
-                Grievance.created_at.desc()
-            ).offset(skip).limit(limit).all()
+            if cursor:
+                query = query.where(tuple_(*CITIZEN_SORT_KEY) < tuple_(*cursor))
+            else:
+                query = query.offset(skip)
+            
+            result = await db.execute(query.order_by(
+                *(column.desc() for column in CITIZEN_SORT_KEY)
+            ).limit(limit + 1))
+            grievances = result.all()
+            
+            has_more = len(grievances) > limit
+            if not has_more:
+                return grievances, False, None
             
-            return grievances, total
+            grievances = grievances[:limit]
+            last = grievances[-1]
+            return grievances, True, encode_cursor((last.created_at, last.id))
             
         except Exception as e:
-            logger.error(f"Error fetching citizen grievances: {e}")
-            return [], 0
+            logger.error("Error fetching citizen grievances: %s", e)
+            return [], False, None
+    
+    @staticmethod
+    async def get_citizen_grievance_count(
+        db: AsyncSession,
+        citizen_id: UUID,
+        status: Optional[GrievanceStatus] = None
+    ) -> int:
+        """
+        Count a citizen's grievances, cached for a few seconds.
+        
+        Args:
+            db: Database session
+            citizen_id: Citizen ID
+            status: Optional status filter
+            
+        Returns:
+            Number of matching grievances
+        """
+        key = ("citizen", citizen_id, status)
+        total = _count_cache.get(key)
+        if total is not None:
+            return total
+        
+        try:
+            query = select(func.count()).select_from(Grievance).where(
+                Grievance.citizen_id == citizen_id
+            )
+            if status:
+                query = query.where(Grievance.status == status)
+            total = (await db.execute(query)).scalar_one()
+        except Exception as e:
+            logger.error("Error counting citizen grievances: %s", e)
+            return 0
+        
+        _count_cache[key] = total
+        return total
     
     @staticmethod
-    def get_officer_grievances(
-        db: Session,
-        officer_id: str,
+    async def get_officer_grievances(
+        db: AsyncSession,
+        officer_id: UUID,
         skip: int = 0,
         limit: int = 10,
         status: Optional[GrievanceStatus] = None,
-        urgency: Optional[GrievanceUrgency] = None
-    ) -> tuple[List[Grievance], int]:
+        urgency: Optional[GrievanceUrgency] = None,
+        cursor: Optional[Tuple[float, datetime, UUID]] = None
+    ) -> tuple[Sequence[Row], bool, Optional[str]]:
         """
-        Get grievances assigned to an officer.
+        Get a page of grievances assigned to an officer, highest priority first.
+        
+        With a cursor the page starts right after the row it points at, which
+        the (officer_id, priority_score, created_at, id) index answers as a
+        range seek. skip is only used when no cursor is given. One extra row
+        is fetched to tell whether another page follows, so no COUNT runs
+        here; see get_officer_grievance_count for totals.
         
         Args:
             db: Database session
@@ -152,47 +339,261 @@ class GrievanceService:
             limit: Number of records to return
             status: Optional status filter
             urgency: Optional urgency filter
+            cursor: (priority_score, created_at, id) of the last row on the previous page
             
         Returns:
-            Tuple of (grievances, total_count)
+            Tuple of (grievance rows, has_more, next_cursor)
         """
         try:
-            query = db.query(Grievance).filter(
-                Grievance.officer_id == UUID(officer_id)
+            query = select(*LIST_COLUMNS).where(
+                Grievance.officer_id == officer_id
             )
             
             if status:
-                query = query.filter(Grievance.status == status)
+                query = query.where(Grievance.status == status)
             
             if urgency:
-                query = query.filter(Grievance.urgency == urgency)
+                query = query.where(Grievance.urgency == urgency)
+            
+            if cursor:
+                query = query.where(tuple_(*OFFICER_SORT_KEY) < tuple_(*cursor))
+            else:
+                query = query.offset(skip)
+            
+            # Order by priority then created_at, with id breaking ties
+            result = await db.execute(query.order_by(
+                *(column.desc() for column in OFFICER_SORT_KEY)
+            ).limit(limit + 1))
+            grievances = result.all()
+            
+            has_more = len(grievances) > limit
+            if not has_more:
+                return grievances, False, None
+            
+            grievances = grievances[:limit]
+            last = grievances[-1]
+            return grievances, True, encode_cursor((last.priority_score, last.created_at, last.id))
             
-            total = query.count()
+        except Exception as e:
+            logger.error("Error fetching officer grievances: %s", e)
+            return [], False, None
+    
+    @staticmethod
+    async def get_officer_grievance_count(
+        db: AsyncSession,
+        officer_id: UUID,
+        status: Optional[GrievanceStatus] = None,
+        urgency: Optional[GrievanceUrgency] = None
+    ) -> int:
+        """
+        Count grievances assigned to an officer, cached for a few seconds.
+        
+        Args:
+            db: Database session
+            officer_id: Officer ID
+            status: Optional status filter
+            urgency: Optional urgency filter
             
-            # Order by priority then created_at
-            grievances = query.order_by(
-                Grievance.priority_score.desc(),
+        Returns:
+            Number of matching grievances
+        """
+        key = ("officer", officer_id, status, urgency)
+        total = _count_cache.get(key)
+        if total is not None:
+            return total
+        
+        try:
+            query = select(func.count()).select_from(Grievance).where(
+                Grievance.officer_id == officer_id
+            )
+            if status:
+                query = query.where(Grievance.status == status)
+            if urgency:
+                query = query.where(Grievance.urgency == urgency)
+            total = (await db.execute(query)).scalar_one()
+        except Exception as e:
+            logger.error("Error counting officer grievances: %s", e)
+            return 0
+        
+        _count_cache[key] = total
+        return total
+    
+    @staticmethod
+    def _invalidate_counts(citizen_id: UUID, officer_id: Optional[UUID] = None) -> None:
+        """Drop every cached total of a grievance's citizen and officer"""
+        for status in _COUNT_STATUSES:
+            _count_cache.pop(("citizen", citizen_id, status), None)
+            if officer_id:
+                for urgency in _COUNT_URGENCIES:
+                    _count_cache.pop(("officer", officer_id, status, urgency), None)
+    
+    @staticmethod
+    async def get_all_grievances(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        status: Optional[GrievanceStatus] = None
+    ) -> tuple[Sequence[Row], int]:
+        """
+        Get a page of all grievances, newest first.
+        
+        The total is computed with a window function in the same statement
+        as the page, so listing takes a single round trip.
+        
+        Args:
+            db: Database session
+            skip: Number of records to skip
+            limit: Number of records to return
+            status: Optional status filter
+            
+        Returns:
+            Tuple of (grievance rows, total_count)
+        """
+        try:
+            query = select(*LIST_COLUMNS, func.count().over().label("total"))
+            
+            if status:
+                query = query.where(Grievance.status == status)
+            
+            result = await db.execute(query.order_by(
                 Grievance.created_at.desc()
-            ).offset(skip).limit(limit).all()
+            ).offset(skip).limit(limit))
+            rows = result.all()
+            
+            if rows:
+                return rows, rows[0].total
             
-            return grievances, total
+            # Past the last page there are no rows to carry the window count
+            if skip == 0:
+                return [], 0
+            count_query = select(func.count()).select_from(Grievance)
+            if status:
+                count_query = count_query.where(Grievance.status == status)
+            total = (await db.execute(count_query)).scalar_one()
+            
+            return [], total
             
         except Exception as e:
-            logger.error(f"Error fetching officer grievances: {e}")
+            logger.error("Error fetching grievances: %s", e)
             return [], 0
     
     @staticmethod
-    def update_grievance_status(
-        db: Session,
-        grievance_id: str,
+    def _overdue(threshold_hours: int):
+        """SQL predicate for open grievances older than the escalation threshold"""
+        cutoff = datetime.utcnow() - timedelta(hours=threshold_hours)
+        return Grievance.status.in_(OPEN_STATUSES) & (Grievance.created_at < cutoff)
+    
+    @staticmethod
+    async def get_overdue_grievances(
+        db: AsyncSession,
+        threshold_hours: int
+    ) -> List[UUID]:
+        """
+        Get IDs of all open grievances past the escalation threshold.
+        
+        Args:
+            db: Database session
+            threshold_hours: Hours after submission before escalation
+            
+        Returns:
+            List of grievance IDs, oldest first
+        """
+        try:
+            result = await db.execute(
+                select(Grievance.id)
+                .where(GrievanceService._overdue(threshold_hours))
+                .order_by(Grievance.created_at.asc())
+            )
+            return result.scalars().all()
+        except Exception as e:
+            logger.error("Error fetching overdue grievances: %s", e)
+            return []
+    
+    @staticmethod
+    async def get_unassigned_grievances(
+        db: AsyncSession,
+        limit: int
+    ) -> Sequence[Row]:
+        """
+        Get submitted grievances no officer has picked up, highest priority first.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of grievances to return
+            
+        Returns:
+            Grievance rows
+        """
+        try:
+            result = await db.execute(
+                select(*LIST_COLUMNS)
+                .where(
+                    Grievance.officer_id.is_(None),
+                    Grievance.status == GrievanceStatus.SUBMITTED
+                )
+                .order_by(Grievance.priority_score.desc(), Grievance.created_at.asc())
+                .limit(limit)
+            )
+            return result.all()
+        except Exception as e:
+            logger.error("Error fetching unassigned grievances: %s", e)
+            return []
+    
+    @staticmethod
+    async def get_escalation_status(
+        db: AsyncSession,
+        grievance_id: UUID,
+        threshold_hours: int
+    ) -> Optional[Dict]:
+        """
+        Check a single grievance against the escalation threshold.
+        
+        Args:
+            db: Database session
+            grievance_id: Grievance ID
+            threshold_hours: Hours after submission before escalation
+            
+        Returns:
+            Dict with status, created_at and needs_escalation, or None if not found
+        """
+        try:
+            result = await db.execute(
+                select(
+                    Grievance.status,
+                    Grievance.created_at,
+                    GrievanceService._overdue(threshold_hours).label("needs_escalation")
+                ).where(Grievance.id == grievance_id)
+            )
+            row = result.first()
+        except Exception as e:
+            logger.error("Error checking grievance escalation: %s", e)
+            return None
+        
+        if row is None:
+            return None
+        return {
+            "status": row.status,
+            "created_at": row.created_at,
+            "needs_escalation": bool(row.needs_escalation)
+        }
+    
+    @staticmethod
+    async def update_grievance_status(
+        db: AsyncSession,
+        grievance_id: UUID,
         new_status: GrievanceStatus,
-        actor_id: str,
+        actor_id: UUID,
         actor_role: str,
-        comment: Optional[str] = None
+        comment: Optional[str] = None,
+        previous_status: Optional[GrievanceStatus] = None
     ) -> bool:
         """
         Update grievance status and create timeline event.
         
+        The change is a single UPDATE ... RETURNING. Callers that have
+        already loaded the grievance pass its status as previous_status;
+        otherwise it is read (and the row locked) first.
+        
         Args:
             db: Database session
             grievance_id: Grievance ID
@@ -200,57 +601,74 @@ class GrievanceService:
             actor_id: User making the change
             actor_role: Role of the actor
             comment: Optional comment
+            previous_status: Status before this change, if already known
             
         Returns:
             Success status
         """
+        values = {"status": new_status}
+        if new_status in (GrievanceStatus.RESOLVED, GrievanceStatus.CLOSED):
+            values["resolved_at"] = datetime.utcnow()
+        
         try:
-            grievance = db.query(Grievance).filter(
-                Grievance.id == UUID(grievance_id)
-            ).first()
-            
-            if not grievance:
-                logger.warning(f"Grievance not found: {grievance_id}")
-                return False
-            
-            old_status = grievance.status
-            grievance.status = new_status
+            if previous_status is None:
+                previous_status = (await db.execute(
+                    select(Grievance.status)
+                    .where(Grievance.id == grievance_id)
+                    .with_for_update()
+                )).scalar()
+                if previous_status is None:
+                    logger.warning("Grievance not found: %s", grievance_id)
+                    return False
             
-            # Update resolved_at if resolved
-            if new_status in [GrievanceStatus.RESOLVED, GrievanceStatus.CLOSED]:
-                grievance.resolved_at = datetime.utcnow()
+            updated = (await db.execute(
+                update(Grievance)
+                .where(Grievance.id == grievance_id)
+                .values(**values)
+                .returning(Grievance.citizen_id, Grievance.officer_id)
+            )).first()
             
-            db.commit()
+            if updated is None:
+                await db.rollback()
+                logger.warning("Grievance not found: %s", grievance_id)
+                return False
             
-            # Create timeline event
-            GrievanceService.add_timeline_event(
+            # Create timeline event; it commits together with the status change
+            await GrievanceService.add_timeline_event(
                 db=db,
                 grievance_id=grievance_id,
                 event_type=EventType.STATUS_UPDATED,
                 actor_id=actor_id,
                 actor_role=actor_role,
-                description=f"Status updated from {old_status.value} to {new_status.value}",
+                description=f"Status updated from {previous_status.value} to {new_status.value}",
                 comment=comment,
-                is_visible_to_citizen=True
+                is_visible_to_citizen=True,
+                commit=False
             )
             
-            logger.info(f"Grievance {grievance_id} status updated to {new_status.value}")
+            await db.commit()
+            GrievanceService._invalidate_counts(updated.citizen_id, updated.officer_id)
+            
+            logger.info("Grievance %s status updated to %s", grievance_id, new_status.value)
             return True
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error updating grievance status: {e}")
+            await db.rollback()
+            logger.error("Error updating grievance status: %s", e)
             return False
     
     @staticmethod
-    def assign_officer(
-        db: Session,
-        grievance_id: str,
-        officer_id: str
+    async def assign_officer(
+        db: AsyncSession,
+        grievance_id: UUID,
+        officer_id: UUID
     ) -> bool:
         """
         Assign officer to grievance.
         
+        The current officer is read (and the row locked) first, so a
+        reassignment drops the previous officer's cached totals too.
+        
         Args:
             db: Database session
             grievance_id: Grievance ID
@@ -260,53 +678,134 @@ class GrievanceService:
             Success status
         """
         try:
-            grievance = db.query(Grievance).filter(
-                Grievance.id == UUID(grievance_id)
-            ).first()
+            previous_officer_id = (await db.execute(
+                select(Grievance.officer_id)
+                .where(Grievance.id == grievance_id)
+                .with_for_update()
+            )).scalar()
             
-            if not grievance:
-                return False
+            citizen_id = (await db.execute(
+                update(Grievance)
+                .where(Grievance.id == grievance_id)
+                .values(
+                    officer_id=officer_id,
+                    assigned_at=datetime.utcnow(),
+                    status=GrievanceStatus.UNDER_REVIEW
+                )
+                .returning(Grievance.citizen_id)
+            )).scalar()
             
-            grievance.officer_id = UUID(officer_id)
-            grievance.assigned_at = datetime.utcnow()
-            grievance.status = GrievanceStatus.UNDER_REVIEW
-            
-            db.commit()
+            if citizen_id is None:
+                await db.rollback()
+                return False
             
-            # Create timeline event
-            GrievanceService.add_timeline_event(
+            # Create timeline event; it commits together with the assignment
+            await GrievanceService.add_timeline_event(
                 db=db,
                 grievance_id=grievance_id,
                 event_type=EventType.ASSIGNED,
                 actor_id=officer_id,
                 actor_role="officer",
                 description=f"Assigned to officer {officer_id}",
-                is_visible_to_citizen=False
+                is_visible_to_citizen=False,
+                commit=False
             )
             
-            logger.info(f"Grievance {grievance_id} assigned to officer {officer_id}")
+            await db.commit()
+            GrievanceService._invalidate_counts(citizen_id, officer_id)
+            if previous_officer_id and previous_officer_id != officer_id:
+                GrievanceService._invalidate_counts(citizen_id, previous_officer_id)
+            
+            logger.info("Grievance %s assigned to officer %s", grievance_id, officer_id)
             return True
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error assigning officer: {e}")
+            await db.rollback()
+            logger.error("Error assigning officer: %s", e)
             return False
     
     @staticmethod
-    def add_timeline_event(
-        db: Session,
-        grievance_id: str,
+    async def assign_officers(
+        db: AsyncSession,
+        assignments: List[Tuple[UUID, UUID]],
+        actor_id: UUID
+    ) -> List[UUID]:
+        """
+        Assign officers to many grievances in one transaction.
+        
+        A grievance that an officer accepted in the meantime is left alone.
+        
+        Args:
+            db: Database session
+            assignments: (grievance_id, officer_id) pairs
+            actor_id: User making the assignments
+            
+        Returns:
+            IDs of the grievances that were assigned
+        """
+        assigned: List[UUID] = []
+        affected = set()
+        try:
+            for grievance_id, officer_id in assignments:
+                citizen_id = (await db.execute(
+                    update(Grievance)
+                    .where(Grievance.id == grievance_id, Grievance.officer_id.is_(None))
+                    .values(
+                        officer_id=officer_id,
+                        assigned_at=datetime.utcnow(),
+                        status=GrievanceStatus.UNDER_REVIEW
+                    )
+                    .returning(Grievance.citizen_id)
+                )).scalar()
+                if citizen_id is None:
+                    continue
+                
+                await GrievanceService.add_timeline_event(
+                    db=db,
+                    grievance_id=grievance_id,
+                    event_type=EventType.ASSIGNED,
+                    actor_id=actor_id,
+                    actor_role="admin",
+                    description=f"Assigned to officer {officer_id}",
+                    is_visible_to_citizen=False,
+                    commit=False
+                )
+                assigned.append(grievance_id)
+                affected.add((citizen_id, officer_id))
+            
+            await db.commit()
+            
+        except Exception as e:
+            await db.rollback()
+            logger.error("Error assigning officers: %s", e)
+            return []
+        
+        for citizen_id, officer_id in affected:
+            GrievanceService._invalidate_counts(citizen_id, officer_id)
+        
+        logger.info("Assigned %d of %d grievances to officers", len(assigned), len(assignments))
+        return assigned
+    
+    @staticmethod
+    async def add_timeline_event(
+        db: AsyncSession,
+        grievance_id: UUID,
         event_type: EventType,
-        actor_id: str,
+        actor_id: UUID,
         actor_role: str,
         description: str,
         comment: Optional[str] = None,
         is_visible_to_citizen: bool = True,
-        event_metadata: Optional[str] = None
+        event_metadata: Optional[dict] = None,
+        commit: bool = True
     ) -> Optional[TimelineEvent]:
         """
         Add timeline event to grievance.
         
+        With commit=False the event is only added to the session, so it is
+        written in the same transaction as the caller's own changes. The
+        caller then owns the commit and the rollback on failure.
+        
         Args:
             db: Database session
             grievance_id: Grievance ID
@@ -316,38 +815,40 @@ class GrievanceService:
             description: Event description
             comment: Optional comment
             is_visible_to_citizen: Visibility flag
-            event_metadata: Optional metadata JSON
+            event_metadata: Optional extra event data
+            commit: Commit the event immediately
             
         Returns:
             Created TimelineEvent or None
         """
+        event = TimelineEvent(
+            grievance_id=grievance_id,
+            event_type=event_type,
+            actor_id=actor_id,
+            actor_role=actor_role,
+            description=description,
+            comment=comment,
+            is_visible_to_citizen=is_visible_to_citizen,
+            event_metadata=event_metadata
+        )
+        db.add(event)
+        
+        if not commit:
+            return event
+        
         try:
-            event = TimelineEvent(
-                grievance_id=UUID(grievance_id),
-                event_type=event_type,
-                actor_id=UUID(actor_id),
-                actor_role=actor_role,
-                description=description,
-                comment=comment,
-                is_visible_to_citizen=is_visible_to_citizen,
-                event_metadata=event_metadata
-            )
-            
-            db.add(event)
-            db.commit()
-            db.refresh(event)
-            
+            await db.commit()
             return event
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error adding timeline event: {e}")
+            await db.rollback()
+            logger.error("Error adding timeline event: %s", e)
             return None
     
     @staticmethod
-    def get_timeline(
-        db: Session,
-        grievance_id: str,
+    async def get_timeline(
+        db: AsyncSession,
+        grievance_id: UUID,
         citizen_view: bool = False
     ) -> List[TimelineEvent]:
         """
@@ -362,25 +863,25 @@ class GrievanceService:
             List of timeline events
         """
         try:
-            query = db.query(TimelineEvent).filter(
-                TimelineEvent.grievance_id == UUID(grievance_id)
+            query = select(TimelineEvent).where(
+                TimelineEvent.grievance_id == grievance_id
             )
             
             if citizen_view:
-                query = query.filter(TimelineEvent.is_visible_to_citizen == True)
+                query = query.where(TimelineEvent.is_visible_to_citizen == True)
             
-            events = query.order_by(TimelineEvent.created_at.asc()).all()
-            return events
+            result = await db.execute(query.order_by(TimelineEvent.created_at.asc()))
+            return result.scalars().all()
             
         except Exception as e:
-            logger.error(f"Error fetching timeline: {e}")
+            logger.error("Error fetching timeline: %s", e)
             return []
     
     @staticmethod
-    def add_comment(
-        db: Session,
-        grievance_id: str,
-        actor_id: str,
+    async def add_comment(
+        db: AsyncSession,
+        grievance_id: UUID,
+        actor_id: UUID,
         actor_role: str,
         comment: str,
         is_visible_to_citizen: bool = True
@@ -400,7 +901,7 @@ class GrievanceService:
             Success status
         """
         try:
-            GrievanceService.add_timeline_event(
+            await GrievanceService.add_timeline_event(
                 db=db,
                 grievance_id=grievance_id,
                 event_type=EventType.COMMENT_ADDED,
@@ -411,22 +912,22 @@ class GrievanceService:
                 is_visible_to_citizen=is_visible_to_citizen
             )
             
-            logger.info(f"Comment added to grievance {grievance_id}")
+            logger.info("Comment added to grievance %s", grievance_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding comment: {e}")
+            logger.error("Error adding comment: %s", e)
             return False
     
     @staticmethod
-    def add_attachment(
-        db: Session,
-        grievance_id: str,
+    async def add_attachment(
+        db: AsyncSession,
+        grievance_id: UUID,
         file_name: str,
         file_size: int,
         file_type: str,
         file_url: str,
-        uploaded_by: str
+        uploaded_by: UUID
     ) -> Optional[Attachment]:
         """
         Add attachment to grievance.
@@ -445,41 +946,42 @@ class GrievanceService:
         """
         try:
             attachment = Attachment(
-                grievance_id=UUID(grievance_id),
+                grievance_id=grievance_id,
                 file_name=file_name,
                 file_size=file_size,
                 file_type=file_type,
                 file_url=file_url,
-                uploaded_by=UUID(uploaded_by)
+                uploaded_by=uploaded_by
             )
             
             db.add(attachment)
-            db.commit()
-            db.refresh(attachment)
             
-            # Create timeline event
-            GrievanceService.add_timeline_event(
+            # Create timeline event; it commits together with the attachment
+            await GrievanceService.add_timeline_event(
                 db=db,
                 grievance_id=grievance_id,
                 event_type=EventType.ATTACHMENT_ADDED,
                 actor_id=uploaded_by,
                 actor_role="citizen",
                 description=f"Attachment added: {file_name}",
-                is_visible_to_citizen=True
+                is_visible_to_citizen=True,
+                commit=False
             )
             
-            logger.info(f"Attachment added to grievance {grievance_id}")
+            await db.commit()
+            
+            logger.info("Attachment added to grievance %s", grievance_id)
             return attachment
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error adding attachment: {e}")
+            await db.rollback()
+            logger.error("Error adding attachment: %s", e)
             return None
     
     @staticmethod
-    def get_attachments(
-        db: Session,
-        grievance_id: str
+    async def get_attachments(
+        db: AsyncSession,
+        grievance_id: UUID
     ) -> List[Attachment]:
         """
         Get attachments for grievance.
@@ -492,16 +994,49 @@ class GrievanceService:
             List of attachments
         """
         try:
-            return db.query(Attachment).filter(
-                Attachment.grievance_id == UUID(grievance_id)
-            ).order_by(Attachment.uploaded_at.desc()).all()
+            result = await db.execute(
+                select(Attachment).where(
+                    Attachment.grievance_id == grievance_id
+                ).order_by(Attachment.uploaded_at.desc())
+            )
+            return result.scalars().all()
         except Exception as e:
-            logger.error(f"Error fetching attachments: {e}")
+            logger.error("Error fetching attachments: %s", e)
             return []
+    
+    @staticmethod
+    async def iter_attachments(
+        db: AsyncSession,
+        grievance_id: UUID,
+        batch_size: int = 100
+    ) -> AsyncIterator[Attachment]:
+        """
+        Stream a grievance's attachments, oldest first.
+        
+        Rows are fetched from a server-side cursor batch_size at a time, so
+        only one batch is held in memory however many attachments exist.
+        
+        Args:
+            db: Database session
+            grievance_id: Grievance ID
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Attachment objects
+        """
+        result = await db.stream(
+            select(Attachment)
+            .where(Attachment.grievance_id == grievance_id)
+            .order_by(Attachment.uploaded_at)
+            .execution_options(yield_per=batch_size)
+        )
+        async for attachment in result.scalars():
+            yield attachment
+    
     @staticmethod
-    def update_image_url(
-        db: Session,
-        grievance_id: str,
+    async def update_image_url(
+        db: AsyncSession,
+        grievance_id: UUID,
         image_url: str
     ) -> bool:
         """
@@ -516,18 +1051,19 @@ class GrievanceService:
             Success status
         """
         try:
-            grievance = db.query(Grievance).filter(
-                Grievance.id == UUID(grievance_id)
-            ).first()
+            result = await db.execute(
+                select(Grievance).where(Grievance.id == grievance_id)
+            )
+            grievance = result.scalars().first()
             
             if not grievance:
                 return False
             
             grievance.image_url = image_url
-            db.commit()
+            await db.commit()
             return True
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error updating grievance image URL: {e}")
+            await db.rollback()
+            logger.error("Error updating grievance image URL: %s", e)
             return False
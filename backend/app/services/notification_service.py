@@ -1,13 +1,89 @@
 """Email notification service"""
 
-import json
-from typing import List, Dict, Optional
+import hashlib
+import logging
+import orjson
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from app.core.logging import get_logger
 from app.core.config import settings
+from app.core.cache import get_sync_redis
 
 logger = get_logger(__name__)
 
+# Separator line around logged notifications
+_RULE = "=" * 60
+
+# Largest number of personalizations SendGrid accepts in one request
+_SENDGRID_BATCH_SIZE = 1000
+
+
+class _SubstitutionTags(dict):
+    """format_map mapping that turns every {field} into a SendGrid -field- tag"""
+    
+    def __missing__(self, key: str) -> str:
+        return f"-{key}-"
+
+
+_TAGS = _SubstitutionTags()
+
+NOTIFICATION_DEDUP_PREFIX = "notify:sent:"
+
+
+def _dedup_key(recipient_email: str, template_name: str, template_vars: Dict[str, str]) -> str:
+    """
+    Build the Redis key identifying one notification.
+    
+    Only the recipient, template, grievance and status go into the key;
+    the other variables include render-time timestamps that differ on
+    every retry.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("|".join((
+        recipient_email,
+        template_name,
+        str(template_vars.get("grievance_id", "")),
+        str(template_vars.get("status", "")),
+    )).encode())
+    return NOTIFICATION_DEDUP_PREFIX + digest.hexdigest()
+
+
+def _is_repeat_notification(
+    recipient_email: str,
+    template_name: str,
+    template_vars: Dict[str, str]
+) -> bool:
+    """Claim a notification for sending, returning True if it was already claimed within the dedup window"""
+    if settings.notification_dedup_seconds <= 0:
+        return False
+    
+    try:
+        first = get_sync_redis().set(
+            _dedup_key(recipient_email, template_name, template_vars), b"1",
+            nx=True, ex=settings.notification_dedup_seconds
+        )
+    except Exception as e:
+        logger.debug("Notification dedup unavailable: %s", e)
+        return False
+    
+    return not first
+
+
+def _release_notification(
+    recipient_email: str,
+    template_name: str,
+    template_vars: Dict[str, str]
+):
+    """Drop a notification's dedup claim so a retry after a failed send goes through"""
+    if settings.notification_dedup_seconds <= 0:
+        return
+    
+    try:
+        get_sync_redis().delete(_dedup_key(recipient_email, template_name, template_vars))
+    except Exception as e:
+        logger.debug("Notification dedup unavailable: %s", e)
+
 
 class NotificationService:
     """Service for sending notifications via email"""
@@ -115,6 +191,23 @@ Smart Griev System
         }
     }
     
+    # Bound format_map renderers per template, built once at import:
+    # (subject, body wrapped as HTML for SendGrid)
+    _RENDERERS = {
+        name: (
+            template["subject"].format_map,
+            f"<pre style='font-family: sans-serif;'>{template['body']}</pre>".format_map,
+        )
+        for name, template in TEMPLATES.items()
+    }
+    
+    # Subject and HTML body with substitution tags in place of fields, for
+    # sending one template to many recipients in a single SendGrid request
+    _BULK_TEMPLATES = {
+        name: (render_subject(_TAGS), render_html(_TAGS))
+        for name, (render_subject, render_html) in _RENDERERS.items()
+    }
+    
     @staticmethod
     def send_notification(
         recipient_email: str,
@@ -124,6 +217,49 @@ Smart Griev System
         """
         Send email notification.
         
+        With ASYNC_NOTIFICATIONS enabled the send is queued for the Celery
+        worker and this returns as soon as the task is published; if the
+        broker can't be reached it falls back to sending in-process.
+        A notification for the same recipient, template, grievance and
+        status as one sent in the last NOTIFICATION_DEDUP_SECONDS (e.g. from
+        a retried request) is skipped; a failed send releases its claim.
+        
+        Args:
+            recipient_email: Recipient email address
+            template_name: Name of email template
+            template_vars: Variables to fill in template
+            
+        Returns:
+            Success status
+        """
+        if _is_repeat_notification(recipient_email, template_name, template_vars):
+            logger.info("Skipping repeat %s notification to %s", template_name, recipient_email)
+            return True
+        
+        if settings.async_notifications:
+            try:
+                from app.worker import send_notification_task
+                send_notification_task.delay(recipient_email, template_name, template_vars)
+                return True
+            except Exception as e:
+                logger.warning("Could not queue notification, sending in-process: %s", e)
+        
+        return NotificationService.deliver_notification(
+            recipient_email, template_name, template_vars
+        )
+    
+    @staticmethod
+    def deliver_notification(
+        recipient_email: str,
+        template_name: str,
+        template_vars: Dict[str, str]
+    ) -> bool:
+        """
+        Render a notification and deliver it now.
+        
+        If delivery fails the notification's dedup claim is released, so a
+        retry is not skipped as a repeat.
+        
         Args:
             recipient_email: Recipient email address
             template_name: Name of email template
@@ -132,56 +268,140 @@ Smart Griev System
         Returns:
             Success status
         """
+        delivered = NotificationService._render_and_send(
+            recipient_email, template_name, template_vars
+        )
+        if not delivered:
+            _release_notification(recipient_email, template_name, template_vars)
+        return delivered
+    
+    @staticmethod
+    def _render_and_send(
+        recipient_email: str,
+        template_name: str,
+        template_vars: Dict[str, str]
+    ) -> bool:
+        """Render a notification and send it through SendGrid, or log it without a key"""
         try:
-            template = NotificationService.TEMPLATES.get(template_name)
-            if not template:
-                logger.error(f"Template {template_name} not found")
+            renderers = NotificationService._RENDERERS.get(template_name)
+            if not renderers:
+                logger.error("Template %s not found", template_name)
                 return False
-                
-            subject = template["subject"].format(**template_vars)
-            body = template["body"].format(**template_vars)
             
-            logger.info(f"Sending notification to {recipient_email} using template {template_name}")
+            render_subject, render_html = renderers
+            subject = render_subject(template_vars)
+            
+            logger.info("Sending notification to %s using template %s", recipient_email, template_name)
             
             if settings.sendgrid_api_key:
                 from app.services.email_service import EmailService
-                # Use HTML content if available, otherwise just text
-                # Ideally templates should support both, for now treating body as text/html
-                # Replacing newlines with <br> for simple text-to-html conversion if needed, 
-                # but better to have proper HTML templates. 
-                # For now, let's assume the body is plain text and wrap it or just send as is.
-                # The EmailService defaults to HTML, so let's format it slightly.
-                html_content = f"<pre style='font-family: sans-serif;'>{body}</pre>"
-                return EmailService.send_email(recipient_email, subject, html_content)
+                # The body is plain text; EmailService sends HTML, so the body
+                # template is pre-wrapped in a <pre> block
+                return EmailService.send_email(recipient_email, subject, render_html(template_vars))
             else:
                 logger.warning("SendGrid API key not configured")
                 NotificationService._log_notification(
-                    recipient_email, template_name, template_vars
+                    recipient_email, template_name, template_vars, subject
                 )
                 return True
             
         except Exception as e:
-            logger.error(f"Error sending notification: {e}")
+            logger.error("Error sending notification: %s", e)
             return False
     
+    @staticmethod
+    def send_batch(
+        notifications: List[Tuple[str, str, Dict[str, str]]]
+    ) -> int:
+        """
+        Send many notifications at once.
+        
+        Notifications sharing a template go out in one SendGrid request
+        (up to 1000 recipients each) instead of one request per email.
+        Queued for the Celery worker when ASYNC_NOTIFICATIONS is enabled.
+        
+        Args:
+            notifications: (recipient_email, template_name, template_vars) tuples
+            
+        Returns:
+            Number of notifications sent or queued
+        """
+        if not notifications:
+            return 0
+        
+        if settings.async_notifications:
+            try:
+                from app.worker import send_notification_batch_task
+                send_notification_batch_task.delay(notifications)
+                return len(notifications)
+            except Exception as e:
+                logger.warning("Could not queue notification batch, sending in-process: %s", e)
+        
+        return NotificationService.deliver_batch(notifications)
+    
+    @staticmethod
+    def deliver_batch(
+        notifications: List[Tuple[str, str, Dict[str, str]]]
+    ) -> int:
+        """
+        Deliver a batch of notifications now, one request per template.
+        
+        Args:
+            notifications: (recipient_email, template_name, template_vars) tuples
+            
+        Returns:
+            Number of notifications delivered
+        """
+        by_template: Dict[str, List[Tuple[str, Dict[str, str]]]] = defaultdict(list)
+        for recipient_email, template_name, template_vars in notifications:
+            by_template[template_name].append((recipient_email, template_vars))
+        
+        delivered = 0
+        for template_name, recipients in by_template.items():
+            bulk_template = NotificationService._BULK_TEMPLATES.get(template_name)
+            if not bulk_template:
+                logger.error("Template %s not found", template_name)
+                continue
+            
+            if not settings.sendgrid_api_key:
+                render_subject = NotificationService._RENDERERS[template_name][0]
+                for recipient_email, template_vars in recipients:
+                    NotificationService._log_notification(
+                        recipient_email, template_name, template_vars,
+                        render_subject(template_vars)
+                    )
+                delivered += len(recipients)
+                continue
+            
+            from app.services.email_service import EmailService
+            subject, html_content = bulk_template
+            for start in range(0, len(recipients), _SENDGRID_BATCH_SIZE):
+                chunk = recipients[start:start + _SENDGRID_BATCH_SIZE]
+                if EmailService.send_bulk(subject, html_content, [
+                    (recipient_email, {f"-{key}-": str(value) for key, value in template_vars.items()})
+                    for recipient_email, template_vars in chunk
+                ]):
+                    delivered += len(chunk)
+        
+        logger.info("Delivered %d of %d batched notifications", delivered, len(notifications))
+        return delivered
+    
     @staticmethod
     def _log_notification(
         recipient_email: str,
         template_name: str,
-        template_vars: Dict[str, str]
+        template_vars: Dict[str, str],
+        subject: str
     ):
         """Log notification for development/debugging"""
-        template = NotificationService.TEMPLATES.get(template_name, {})
-        subject = template.get("subject", "Notification").format(**template_vars)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
-        logger.info(f"\n{'='*60}")
-        logger.info(f"EMAIL NOTIFICATION")
-        logger.info(f"{'='*60}")
-        logger.info(f"To: {recipient_email}")
-        logger.info(f"Subject: {subject}")
-        logger.info(f"Template: {template_name}")
-        logger.info(f"Variables: {json.dumps(template_vars, indent=2)}")
-        logger.info(f"{'='*60}\n")
+        logger.info(
+            "\n%s\nEMAIL NOTIFICATION\n%s\nTo: %s\nSubject: %s\nTemplate: %s\nVariables: %s\n%s\n",
+            _RULE, _RULE, recipient_email, subject, template_name,
+            orjson.dumps(template_vars).decode(), _RULE
+        )
     
     @staticmethod
     def notify_grievance_submitted(
@@ -284,6 +504,25 @@ Smart Griev System
     ) -> bool:
         """Notify officer of new grievance assignment"""
         return NotificationService.send_notification(
+            *NotificationService.officer_assignment(
+                recipient_email, officer_name, grievance_id, citizen_name,
+                category, urgency, priority_score, grievance_text
+            )
+        )
+    
+    @staticmethod
+    def officer_assignment(
+        recipient_email: str,
+        officer_name: str,
+        grievance_id: str,
+        citizen_name: str,
+        category: str,
+        urgency: str,
+        priority_score: float,
+        grievance_text: str
+    ) -> Tuple[str, str, Dict[str, str]]:
+        """Build an officer assignment notification for send_notification or send_batch"""
+        return (
             recipient_email,
             "officer_assignment",
             {
@@ -1,13 +1,78 @@
 """Automatic grievance routing service"""
 
-from typing import Dict, Optional
-from sqlalchemy.orm import Session
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from cachetools import TTLCache
 from app.core.logging import get_logger
-from app.models.grievance import GrievanceCategory
+from app.models.grievance import Grievance, GrievanceCategory
 from app.models.department import Department
+from app.models.user import User, UserRole
+from app.services.grievance_service import OPEN_STATUSES
 
 logger = get_logger(__name__)
 
+# Departments from the last 30 seconds. Routing picks from these and claims
+# capacity with an atomic UPDATE, which keeps the cached loads current for
+# this process and leaves the final capacity check to the database.
+_department_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+_DEPARTMENTS_KEY = "all"
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingResult:
+    """Outcome of routing one grievance"""
+    success: bool
+    message: str
+    department_id: Optional[UUID] = None
+    department_name: Optional[str] = None
+    department_code: Optional[str] = None
+    priority_score: Optional[float] = None
+    is_duplicate: bool = False
+    expected_resolution_time: Optional[int] = None
+    reason: Optional[str] = None
+    
+    @classmethod
+    def routed(
+        cls,
+        department: Department,
+        priority_score: float,
+        is_duplicate: bool
+    ) -> "RoutingResult":
+        """Result for a grievance routed to department"""
+        return cls(
+            success=True,
+            message="Grievance routed successfully",
+            department_id=department.id,
+            department_name=department.name,
+            department_code=department.code,
+            priority_score=priority_score,
+            is_duplicate=is_duplicate,
+            expected_resolution_time=department.avg_resolution_time
+        )
+    
+    @classmethod
+    def failed(cls, error: Exception) -> "RoutingResult":
+        """Result for a routing attempt that raised"""
+        return cls(
+            success=False,
+            message=f"Routing failed: {str(error)}",
+            reason=str(error)
+        )
+
+
+# Immutable, so every "no capacity" outcome shares one instance
+NO_DEPARTMENT = RoutingResult(
+    success=False,
+    message="No suitable department found",
+    reason="All departments at capacity"
+)
+
 
 class RoutingService:
     """Service for automatic department routing"""
@@ -26,10 +91,42 @@ class RoutingService:
         GrievanceCategory.ENVIRONMENT: "environment",
         GrievanceCategory.OTHER: "general",
     }
+    _DEFAULT_DEPT_CODE = CATEGORY_DEPARTMENT_MAP[GrievanceCategory.OTHER]
+    
+    # Re-selects allowed when a department fills up mid-routing
+    MAX_ROUTING_ATTEMPTS = 3
+    
+    @staticmethod
+    async def get_departments(db: AsyncSession) -> List[Department]:
+        """
+        Get all departments, served from a short-lived cache when possible.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Detached Department objects
+        """
+        departments = _department_cache.get(_DEPARTMENTS_KEY)
+        if departments is not None:
+            return departments
+        
+        result = await db.execute(select(Department))
+        departments = result.scalars().all()
+        # Detached so they outlive this session and its rollbacks
+        for department in departments:
+            db.expunge(department)
+        _department_cache[_DEPARTMENTS_KEY] = departments
+        return departments
     
     @staticmethod
-    def get_best_department(
-        db: Session,
+    def invalidate_department_cache():
+        """Drop the cached departments, e.g. after departments are changed"""
+        _department_cache.clear()
+    
+    @staticmethod
+    async def get_best_department(
+        db: AsyncSession,
         category: GrievanceCategory,
         priority_score: float
     ) -> Optional[Department]:
@@ -46,46 +143,45 @@ class RoutingService:
         """
         # Get department code from category
         dept_code = RoutingService.CATEGORY_DEPARTMENT_MAP.get(
-            category,
-            RoutingService.CATEGORY_DEPARTMENT_MAP[GrievanceCategory.OTHER]
+            category, RoutingService._DEFAULT_DEPT_CODE
         )
         
-        # Query departments that handle this category
-        departments = db.query(Department).filter(
-            Department.code == dept_code,
-            Department.current_load < Department.max_capacity
-        ).order_by(
-            Department.current_load.asc()  # Least loaded first
-        ).all()
-        
-        if not departments:
-            logger.warning(f"No available departments for category {category}")
-            # Try to find any available department
-            departments = db.query(Department).filter(
-                Department.current_load < Department.max_capacity
-            ).order_by(
-                Department.current_load.asc()
-            ).limit(1).all()
-        
-        if not departments:
-            logger.error(f"No available departments found")
+        # Prefer the category's department, otherwise any department with
+        # capacity, least loaded first
+        available = [
+            department for department in await RoutingService.get_departments(db)
+            if department.current_load < department.max_capacity
+        ]
+        best_dept = min(
+            available,
+            key=lambda department: (department.code != dept_code, department.current_load),
+            default=None
+        )
+        
+        if not best_dept:
+            logger.error("No available departments found")
             return None
         
-        best_dept = departments[0]
+        if best_dept.code != dept_code:
+            logger.warning(
+                "No available departments for category %s, falling back to %s",
+                category, best_dept.code
+            )
+        
         logger.info(
-            f"Routed grievance to department {best_dept.name} "
-            f"(load: {best_dept.current_load}/{best_dept.max_capacity})"
+            "Routed grievance to department %s (load: %d/%d)",
+            best_dept.name, best_dept.current_load, best_dept.max_capacity
         )
         return best_dept
     
     @staticmethod
-    def route_grievance(
-        db: Session,
+    async def route_grievance(
+        db: AsyncSession,
         grievance_id: str,
         category: GrievanceCategory,
         priority_score: float,
         is_duplicate: bool = False
-    ) -> Dict[str, any]:
+    ) -> RoutingResult:
         """
         Route grievance to appropriate department.
         
@@ -97,57 +193,72 @@ class RoutingService:
             is_duplicate: Whether it's a duplicate
             
         Returns:
-            Routing result dict
+            Routing result
         """
-        logger.info(f"Starting routing for grievance {grievance_id}")
-        
-        # Get best department
-        department = RoutingService.get_best_department(db, category, priority_score)
+        logger.info("Starting routing for grievance %s", grievance_id)
         
-        if not department:
-            return {
-                "success": False,
-                "message": "No suitable department found",
-                "department_id": None,
-                "reason": "All departments at capacity"
-            }
-        
-        # Update department load
         try:
-            department.current_load += 1
-            db.commit()
+            # Claim a slot atomically; if another request filled the
+            # department between the SELECT and the UPDATE, pick again
+            for _ in range(RoutingService.MAX_ROUTING_ATTEMPTS):
+                department = await RoutingService.get_best_department(
+                    db, category, priority_score
+                )
+                if not department:
+                    return NO_DEPARTMENT
+                
+                claimed = await db.execute(
+                    update(Department)
+                    .where(
+                        Department.id == department.id,
+                        Department.current_load < Department.max_capacity
+                    )
+                    .values(current_load=Department.current_load + 1)
+                    .returning(Department.current_load)
+                )
+                current_load = claimed.scalar_one_or_none()
+                if current_load is not None:
+                    set_committed_value(department, "current_load", current_load)
+                    break
+                
+                # Our cached load was behind; skip this department from now on
+                set_committed_value(department, "current_load", department.max_capacity)
+                logger.info("Department %s filled up while routing, retrying", department.code)
+            else:
+                return NO_DEPARTMENT
             
-            result = {
-                "success": True,
-                "message": "Grievance routed successfully",
-                "department_id": str(department.id),
-                "department_name": department.name,
-                "department_code": department.code,
-                "priority_score": priority_score,
-                "is_duplicate": is_duplicate,
-                "expected_resolution_time": department.avg_resolution_time
-            }
+            await db.commit()
             
-            logger.info(f"Grievance {grievance_id} routed to {department.name}")
-            return result
+            logger.info("Grievance %s routed to %s", grievance_id, department.name)
+            return RoutingResult.routed(department, priority_score, is_duplicate)
             
         except Exception as e:
-            db.rollback()
-            logger.error(f"Error routing grievance: {e}")
-            return {
-                "success": False,
-                "message": f"Routing failed: {str(e)}",
-                "department_id": None,
-                "reason": str(e)
-            }
+            await db.rollback()
+            logger.error("Error routing grievance: %s", e)
+            return RoutingResult.failed(e)
+    
+    @staticmethod
+    def _officer_loads():
+        """Active officers with their number of open grievances"""
+        open_grievances = func.count(Grievance.id)
+        return select(User.id, User.department_id, open_grievances).outerjoin(
+            Grievance,
+            and_(
+                Grievance.officer_id == User.id,
+                Grievance.status.in_(OPEN_STATUSES)
+            )
+        ).where(
+            User.role == UserRole.OFFICER,
+            User.is_active == True
+        ).group_by(User.id, User.department_id), open_grievances
     
     @staticmethod
-    def assign_officer(
-        db: Session,
-        department_id: str
-    ) -> Optional[str]:
+    async def assign_officer(
+        db: AsyncSession,
+        department_id: UUID
+    ) -> Optional[UUID]:
         """
-        Assign best available officer from department.
+        Assign the least loaded active officer from department.
         
         Args:
             db: Database session
@@ -157,23 +268,75 @@ class RoutingService:
             Officer ID or None if no officers available
         """
         try:
-            # This would typically find the least loaded officer in the department
-            # For now, returns first available officer
-            from app.models.user import User, UserRole
+            query, open_grievances = RoutingService._officer_loads()
+            result = await db.execute(
+                query.where(User.department_id == department_id)
+                .order_by(open_grievances.asc(), User.id)
+                .limit(1)
+            )
+            officer_id = result.scalars().first()
             
-            officer = db.query(User).filter(
-                User.department_id == department_id,
-                User.role == UserRole.OFFICER,
-                User.is_active == True
-            ).first()
+            if officer_id:
+                logger.info("Assigned officer %s to department %s", officer_id, department_id)
+                return officer_id
             
-            if officer:
-                logger.info(f"Assigned officer {officer.id} to department {department_id}")
-                return str(officer.id)
-            
-            logger.warning(f"No available officers in department {department_id}")
+            logger.warning("No available officers in department %s", department_id)
             return None
             
         except Exception as e:
-            logger.error(f"Error assigning officer: {e}")
+            logger.error("Error assigning officer: %s", e)
             return None
+    
+    @staticmethod
+    async def assign_officers_bulk(
+        db: AsyncSession,
+        department_ids: List[UUID]
+    ) -> List[Optional[UUID]]:
+        """
+        Pick officers for a batch of grievances with one aggregated query.
+        
+        Each grievance goes to the least loaded active officer of its
+        department, counting the grievances already handed out in this
+        batch, so a backlog is spread across the department instead of
+        landing on whoever was least loaded at the start.
+        
+        Args:
+            db: Database session
+            department_ids: Department ID of each grievance
+            
+        Returns:
+            Officer ID (or None) for each grievance, in the same order
+        """
+        if not department_ids:
+            return []
+        
+        try:
+            query, _ = RoutingService._officer_loads()
+            result = await db.execute(
+                query.where(User.department_id.in_(set(department_ids)))
+            )
+        except Exception as e:
+            logger.error("Error assigning officers: %s", e)
+            return [None] * len(department_ids)
+        
+        # Per department, a heap of (open grievances, officer ID)
+        loads: Dict[UUID, List[Tuple[int, UUID]]] = defaultdict(list)
+        for officer_id, department_id, open_grievances in result:
+            loads[department_id].append((open_grievances, officer_id))
+        for heap in loads.values():
+            heapq.heapify(heap)
+        
+        assigned: List[Optional[UUID]] = []
+        for department_id in department_ids:
+            heap = loads.get(department_id)
+            if not heap:
+                assigned.append(None)
+                continue
+            open_grievances, officer_id = heap[0]
+            heapq.heapreplace(heap, (open_grievances + 1, officer_id))
+            assigned.append(officer_id)
+        
+        missing = assigned.count(None)
+        if missing:
+            logger.warning("No available officers for %d grievances", missing)
+        return assigned
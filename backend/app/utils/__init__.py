@@ -1,9 +1,10 @@
 """Utility functions and helpers"""
 
-from .dependencies import get_current_user, RoleChecker
+from .dependencies import AuthenticatedUser, get_current_user, RoleChecker
 from .exceptions import APIException, ValidationError, NotFoundError, UnauthorizedError
 
 __all__ = [
+    "AuthenticatedUser",
     "get_current_user",
     "RoleChecker",
     "APIException",
@@ -1,22 +1,167 @@
-"""FastAPI dependencies for authentication and authorization"""
+"""FastAPI dependencies for authentication, authorization and shared services"""
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import get_redis
+from app.core.config import settings
 from app.core.security import verify_token
 from app.core.logging import get_logger
 from app.db.session import get_db
 from app.models.user import User, UserRole
-from sqlalchemy.orm import Session
+from app.services.ai_batcher import AIBatcher
+from app.services.ai_service import get_ai_service
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 security = HTTPBearer()
 
+USER_CACHE_PREFIX = "authgate:user:"
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """The columns of the requesting user that endpoints read"""
+    id: UUID
+    email: str
+    full_name: str
+    role: UserRole
+    phone: Optional[str]
+    department_id: Optional[UUID]
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+
+
+# Loaded by get_current_user instead of the full User entity
+_AUTHENTICATED_USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.role,
+    User.phone,
+    User.department_id,
+    User.is_active,
+    User.is_verified,
+    User.created_at,
+)
+
+# Users resolved in the last 10 seconds, keyed by id. Checked before the
+# Redis user cache, so most requests touch neither Redis nor the database.
+# Only used from the event loop, so no lock is needed.
+_current_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=10)
+
+# Access token claims verified in the last minute, keyed by a digest of the
+# token. Repeat requests from the same client skip the signature check;
+# entries are still refused once the token's own expiry has passed.
+_token_cache: TTLCache = TTLCache(maxsize=50_000, ttl=60)
+
+# Used when the app runs without its lifespan (e.g. a bare TestClient)
+_fallback_ai_queue: Optional[AIBatcher] = None
+
+
+def _user_cache_key(user_id: UUID) -> str:
+    """Build the Redis key for a user's cached projection"""
+    return f"{USER_CACHE_PREFIX}{user_id}"
+
+
+async def get_cached_user(user_id: UUID) -> Optional[AuthenticatedUser]:
+    """Load the cached user projection, if any"""
+    if settings.auth_cache_ttl_seconds <= 0:
+        return None
+    
+    try:
+        cached = await get_redis().get(_user_cache_key(user_id))
+    except Exception as e:
+        logger.debug("User cache unavailable: %s", e)
+        return None
+    
+    if not cached:
+        return None
+    
+    data = orjson.loads(cached)
+    return AuthenticatedUser(
+        id=UUID(data["id"]),
+        email=data["email"],
+        full_name=data["full_name"],
+        role=UserRole(data["role"]),
+        phone=data["phone"],
+        department_id=UUID(data["department_id"]) if data["department_id"] else None,
+        is_active=data["is_active"],
+        is_verified=data["is_verified"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+    )
+
+
+async def cache_user(user: AuthenticatedUser):
+    """
+    Cache the user projection for every worker.
+    
+    Keyed by user ID rather than token, so invalidate_user can drop it for
+    all of the user's sessions at once.
+    """
+    if settings.auth_cache_ttl_seconds <= 0:
+        return
+    
+    data = orjson.dumps({
+        "id": str(user.id),
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": user.role.value,
+        "phone": user.phone,
+        "department_id": str(user.department_id) if user.department_id else None,
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "created_at": user.created_at.isoformat(),
+    })
+    
+    try:
+        await get_redis().set(
+            _user_cache_key(user.id), data, ex=settings.auth_cache_ttl_seconds
+        )
+    except Exception as e:
+        logger.debug("User cache unavailable: %s", e)
+
+
+def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify an access token, reusing claims verified in the last minute"""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    
+    payload = verify_token(token, token_type="access")
+    if payload is not None:
+        _token_cache[key] = payload
+    return payload
+
+
+async def invalidate_user(user_id: UUID):
+    """
+    Drop the cached user, e.g. after a password, role or is_active change.
+    
+    Clears the shared Redis entry and this process's copy; other workers
+    keep theirs for at most the 10 second in-process TTL.
+    """
+    _current_user_cache.pop(user_id, None)
+    try:
+        await get_redis().delete(_user_cache_key(user_id))
+    except Exception as e:
+        logger.debug("User cache unavailable: %s", e)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> AuthenticatedUser:
     """
     Get current authenticated user from JWT token.
     
@@ -28,7 +173,7 @@ async def get_current_user(
     token = credentials.credentials
     
     # Verify token
-    payload = verify_token(token, token_type="access")
+    payload = verify_access_token(token)
     
     if not payload:
         raise HTTPException(
@@ -46,48 +191,67 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    user_id = UUID(user_id)
     
-    if not user:
+    # Only active users are ever cached, so a deactivation is picked up
+    # once the entry is invalidated or expires
+    user = _current_user_cache.get(user_id)
+    if user is not None:
+        return user
+    
+    user = await get_cached_user(user_id)
+    if user:
+        _current_user_cache[user_id] = user
+        return user
+    
+    # Get user from database, without building a full ORM entity
+    result = await db.execute(
+        select(*_AUTHENTICATED_USER_COLUMNS).where(User.id == user_id)
+    )
+    row = result.first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user = AuthenticatedUser(**row._mapping)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
     
+    _current_user_cache[user_id] = user
+    await cache_user(user)
     return user
 
 
 class RoleChecker:
     """Dependency for checking user roles"""
     
-    def __init__(self, allowed_roles: list):
+    def __init__(self, allowed_roles: Iterable[UserRole]):
         """
         Initialize role checker.
         
         Args:
-            allowed_roles: List of allowed roles
+            allowed_roles: Allowed roles
         """
-        self.allowed_roles = allowed_roles
+        self.allowed_roles = frozenset(allowed_roles)
     
     async def __call__(
         self,
-        current_user: User = Depends(get_current_user)
-    ) -> User:
+        current_user: AuthenticatedUser = Depends(get_current_user)
+    ) -> AuthenticatedUser:
         """
         Check if user has allowed role.
         
         Usage:
             @app.get("/admin")
             async def admin_only(
-                current_user: User = Depends(RoleChecker([UserRole.ADMIN]))
+                current_user: AuthenticatedUser = Depends(RoleChecker([UserRole.ADMIN]))
             ):
                 return current_user
         """
@@ -99,16 +263,40 @@ class RoleChecker:
         return current_user
 
 
+# Built once; a RoleChecker holds no per-request state
+_citizen_checker = RoleChecker([UserRole.CITIZEN])
+_officer_checker = RoleChecker([UserRole.OFFICER, UserRole.ADMIN])
+_admin_checker = RoleChecker([UserRole.ADMIN])
+
+
 def get_citizen_checker():
     """Role checker for citizens"""
-    return RoleChecker([UserRole.CITIZEN])
+    return _citizen_checker
 
 
 def get_officer_checker():
     """Role checker for officers"""
-    return RoleChecker([UserRole.OFFICER, UserRole.ADMIN])
+    return _officer_checker
 
 
 def get_admin_checker():
     """Role checker for admins"""
-    return RoleChecker([UserRole.ADMIN])
+    return _admin_checker
+
+
+def get_ai_queue(request: Request) -> AIBatcher:
+    """
+    Dependency to get the shared AI analysis queue.
+    
+    The queue and its AIService are created once in the application
+    lifespan and kept on app.state.
+    """
+    ai_queue = getattr(request.app.state, "ai_queue", None)
+    if ai_queue is not None:
+        return ai_queue
+    
+    global _fallback_ai_queue
+    if _fallback_ai_queue is None:
+        # Never started, so submissions are analyzed directly in a thread
+        _fallback_ai_queue = AIBatcher(get_ai_service())
+    return _fallback_ai_queue
@@ -0,0 +1,51 @@
+"""Opaque cursor tokens for keyset pagination"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+import orjson
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page as a URL-safe token.
+    
+    Args:
+        values: Sort key values (datetimes, UUIDs and numbers)
+    
+    Returns:
+        Base64-encoded JSON token
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Decode a token produced by encode_cursor.
+    
+    Args:
+        token: Cursor token from a previous page
+        types: Expected type of each sort key value
+    
+    Returns:
+        Tuple of sort key values
+    
+    Raises:
+        ValueError: If the token is malformed or doesn't match types
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, orjson.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    
+    try:
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
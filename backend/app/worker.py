@@ -0,0 +1,43 @@
+"""
+Celery worker for work that shouldn't run inside request handlers.
+
+Only used when ASYNC_NOTIFICATIONS is enabled. Start a worker with:
+
+    celery -A app.worker worker --loglevel=info
+"""
+
+from typing import Dict, List
+from celery import Celery
+from app.core.config import settings
+from app.services.notification_service import NotificationService
+
+celery_app = Celery(
+    "smartgriev",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend,
+)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+)
+
+
+@celery_app.task(name="notifications.send")
+def send_notification_task(
+    recipient_email: str,
+    template_name: str,
+    template_vars: Dict[str, str]
+) -> bool:
+    """Render and deliver a notification on the worker"""
+    return NotificationService.deliver_notification(
+        recipient_email, template_name, template_vars
+    )
+
+
+@celery_app.task(name="notifications.send_batch")
+def send_notification_batch_task(notifications: List[List]) -> int:
+    """Deliver a batch of notifications on the worker"""
+    return NotificationService.deliver_batch(
+        [tuple(notification) for notification in notifications]
+    )
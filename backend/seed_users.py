@@ -1,8 +1,11 @@
 
-from app.db.session import SessionLocal
+import asyncio
+from sqlalchemy import select
+from app.db.session import AsyncSessionLocal
 from app.services.auth_service import AuthService
 from app.schemas.user import UserCreate
 from app.models.user import User, UserRole
+from app.utils.dependencies import invalidate_user
 import logging
 
 # Configure logging
@@ -12,9 +15,9 @@ logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
-def seed_users():
+async def seed_users():
     print("Starting user seeding...")
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         from app.core.security import get_password_hash
         
@@ -25,10 +28,11 @@ def seed_users():
         ]
         
         for email, name, role in users_to_seed:
-            user = db.query(User).filter(User.email == email).first()
+            result = await db.execute(select(User).where(User.email == email))
+            user = result.scalars().first()
             if not user:
                 print(f"Creating {role} user: {email}...")
-                AuthService.register_user(db, UserCreate(
+                await AuthService.register_user(db, UserCreate(
                     email=email,
                     password="password123",
                     full_name=name,
@@ -39,14 +43,17 @@ def seed_users():
                 user.password_hash = get_password_hash("password123")
                 user.is_active = True
                 user.role = role # Ensure role is correct
-                db.commit()
+                await db.commit()
+                # Running API workers must not keep serving the old role
+                await invalidate_user(user.id)
                 
         # Final Verification
         print("\nVerifying all seeded users...")
         from app.core.security import verify_password
         all_ok = True
         for email, _, _ in users_to_seed:
-            u = db.query(User).filter(User.email == email).first()
+            result = await db.execute(select(User).where(User.email == email))
+            u = result.scalars().first()
             if u and verify_password("password123", u.password_hash):
                 print(f"SUCCESS: {email} password verified.")
             else:
@@ -65,7 +72,7 @@ def seed_users():
         print(f"CRITICAL ERROR SEEDING USERS: {e}")
     finally:
         print("Finished seeding process.")
-        db.close()
+        await db.close()
 
 if __name__ == "__main__":
-    seed_users()
+    asyncio.run(seed_users())
@@ -3,66 +3,116 @@
 import pytest
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
 from app.core.config import settings
+from app.services.grievance_service import _count_cache
+from app.services.routing_service import _department_cache
+from app.utils.dependencies import _current_user_cache
 
 
-# Test database
-TEST_DATABASE_URL = "sqlite:///./test.db"
+
+@compiles(UUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    """Store PostgreSQL UUID columns as 32-character hex strings on SQLite"""
+    return "CHAR(32)"
+
+
+# Test database: one named in-memory SQLite database in shared-cache mode,
+# so the sync seeding engine and the API's async engine see the same data
+# without touching disk. StaticPool keeps a connection open, which keeps
+# the database alive for the whole run.
+TEST_DATABASE_URL = "sqlite:///file:smartgriev_test?mode=memory&cache=shared&uri=true"
 engine = create_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The API runs on AsyncSession, so requests get their own async engine
+# pointed at the same database. Connections aren't pooled because each
+# TestClient runs requests on its own event loop.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///file:smartgriev_test?mode=memory&cache=shared&uri=true",
+    poolclass=NullPool,
+)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
-def override_get_db():
+async def override_get_db():
     """Override database dependency for tests"""
-    try:
-        db = TestingSessionLocal()
+    async with AsyncTestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def setup_database():
-    """Create tables before each test"""
+    """Create tables once per test run"""
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
 
 
+def empty_database():
+    """Delete every row and drop the in-process caches"""
+    # The API commits on its own connection, so a rolled-back outer
+    # transaction wouldn't undo its writes; deleting rows is still far
+    # cheaper than recreating the schema
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    # Cached rows would outlive the deleted ones
+    _count_cache.clear()
+    _department_cache.clear()
+    _current_user_cache.clear()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def clean_module_database():
+    """Empty the tables after each test module"""
+    yield
+    empty_database()
+
+
 @pytest.fixture
+def clean_database():
+    """Empty the tables after the test, for modules whose tests need a fresh database"""
+    yield
+    empty_database()
+
+
+@pytest.fixture(scope="module")
 def db():
-    """Database session fixture"""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    
+    """Database session fixture for seeding test data"""
+    session = TestingSessionLocal()
+
     yield session
-    
+
     session.close()
-    transaction.rollback()
-    connection.close()
 
 
-@pytest.fixture
-def client(db):
+@pytest.fixture(scope="module")
+def client():
     """FastAPI test client"""
-    app.dependency_overrides[get_db] = lambda: db
-    
+    app.dependency_overrides[get_db] = override_get_db
+
     yield TestClient(app)
-    
+
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_user_data():
     """Test user data"""
     return {
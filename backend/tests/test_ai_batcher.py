@@ -0,0 +1,146 @@
+"""Tests for the AI analysis micro-batcher"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.ai_batcher import AIBatcher
+from app.services.ai_service import AIService
+
+
+EXISTING = [
+    {"id": "g1", "text": "No water supply in our street for three days", "status": "submitted"},
+    {"id": "g2", "text": "Huge pothole on the main road near the school", "status": "submitted"},
+]
+
+TEXTS = [
+    "No water supply in our street for three days now",
+    "Huge pothole on the main road near the school gate",
+    "Garbage not collected from the market for a week",
+    "Street lights broken near the bus stand",
+]
+
+
+class RecordingAIService(AIService):
+    """AIService that records the size of every batch it analyzes"""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def analyze_batch(self, items):
+        self.batch_sizes.append(len(items))
+        return super().analyze_batch(items)
+
+
+class FailingAIService(AIService):
+    """AIService whose batch analysis always fails"""
+
+    def analyze_batch(self, items):
+        raise RuntimeError("model unavailable")
+
+
+class BlockingAIService(AIService):
+    """AIService whose batch analysis waits until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def analyze_batch(self, items):
+        self.started.set()
+        self.release.wait(5)
+        return super().analyze_batch(items)
+
+
+async def submit_all(batcher, texts, existing):
+    """Submit texts concurrently through a running batcher"""
+    batcher.start()
+    try:
+        return await asyncio.gather(
+            *(batcher.submit(text, existing) for text in texts),
+            return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+
+@pytest.fixture(scope="module")
+def ai_service():
+    """One service instance shared across calls, as in the app"""
+    return RecordingAIService()
+
+
+def test_concurrent_submissions_share_a_batch(ai_service):
+    """Test that requests arriving together are analyzed in one call"""
+    ai_service.batch_sizes.clear()
+    batcher = AIBatcher(ai_service, max_batch=8, max_wait_ms=200)
+
+    asyncio.run(submit_all(batcher, TEXTS, EXISTING))
+
+    assert ai_service.batch_sizes == [len(TEXTS)]
+
+
+def test_batch_is_split_at_max_batch(ai_service):
+    """Test that a batch never grows past max_batch"""
+    ai_service.batch_sizes.clear()
+    batcher = AIBatcher(ai_service, max_batch=3, max_wait_ms=200)
+
+    asyncio.run(submit_all(batcher, TEXTS, EXISTING))
+
+    assert ai_service.batch_sizes == [3, 1]
+
+
+@pytest.mark.parametrize("existing", [EXISTING, None])
+def test_batched_results_match_direct_analysis(ai_service, existing):
+    """Test that every caller gets its own result, as a direct call would return"""
+    batcher = AIBatcher(ai_service, max_batch=3, max_wait_ms=200)
+
+    results = asyncio.run(submit_all(batcher, TEXTS, existing))
+
+    assert results == [ai_service.analyze_grievance(text, existing) for text in TEXTS]
+
+
+def test_batch_failure_reaches_every_caller():
+    """Test that a failed batch raises in each waiting request"""
+    batcher = AIBatcher(FailingAIService(), max_batch=8, max_wait_ms=200)
+
+    results = asyncio.run(submit_all(batcher, TEXTS, EXISTING))
+
+    assert len(results) == len(TEXTS)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_submit_without_worker_analyzes_directly(ai_service):
+    """Test that submit falls back to a direct call when not started"""
+    batcher = AIBatcher(ai_service)
+
+    result = asyncio.run(batcher.submit(TEXTS[0], EXISTING))
+
+    assert result == ai_service.analyze_grievance(TEXTS[0], EXISTING)
+
+
+def test_stop_fails_in_flight_batch():
+    """Test that stopping mid-analysis fails the waiting requests instead of leaving them hanging"""
+    ai_service = BlockingAIService()
+    batcher = AIBatcher(ai_service, max_batch=2, max_wait_ms=0)
+
+    async def stop_during_analysis():
+        batcher.start()
+        waiting = asyncio.gather(
+            *(batcher.submit(text, EXISTING) for text in TEXTS[:3]),
+            return_exceptions=True
+        )
+        await asyncio.to_thread(ai_service.started.wait, 5)
+        await batcher.stop()
+        try:
+            return await asyncio.wait_for(waiting, 1)
+        finally:
+            ai_service.release.set()
+
+    results = asyncio.run(stop_during_analysis())
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
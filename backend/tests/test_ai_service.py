@@ -0,0 +1,139 @@
+"""Tests for AI duplicate detection"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+
+
+def reference_duplicate(text, existing):
+    """Duplicate check as originally written: one TF-IDF fit per call"""
+    vectorizer = TfidfVectorizer(
+        max_features=1000,
+        min_df=settings.tf_idf_min_df,
+        max_df=settings.tf_idf_max_df,
+        stop_words='english'
+    )
+    try:
+        matrix = vectorizer.fit_transform([text] + [g["text"] for g in existing])
+    except ValueError:
+        return None
+    similarities = cosine_similarity(matrix[0:1], matrix[1:]).flatten()
+    best = int(np.argmax(similarities))
+    if similarities[best] < settings.similarity_threshold:
+        return None
+    return existing[best]["id"], float(similarities[best])
+
+
+CITIZEN_A = [
+    {"id": "a1", "text": "No water supply in our street for three days"},
+    {"id": "a2", "text": "Water supply pipeline leaking near the park"},
+]
+
+CITIZEN_B = [
+    {"id": "b1", "text": "Huge pothole on the main road near the school"},
+    {"id": "b2", "text": "Street lights broken on the main road near the school"},
+    {"id": "b3", "text": "Garbage not collected from the market for a week"},
+]
+
+
+@pytest.fixture(scope="module")
+def ai_service():
+    """One service instance shared across calls, as in the app"""
+    return AIService()
+
+
+def as_result(duplicate):
+    """Reduce detect_duplicates output to what the reference returns"""
+    if duplicate is None:
+        return None
+    return duplicate["duplicate_of_id"], duplicate["similarity_score"]
+
+
+def assert_matches_reference(ai_service, text, existing):
+    expected = reference_duplicate(text, existing)
+    actual = as_result(ai_service.detect_duplicates(text, existing))
+    if expected is None:
+        assert actual is None
+    else:
+        assert actual is not None
+        assert actual[0] == expected[0]
+        assert actual[1] == pytest.approx(expected[1])
+
+
+def test_duplicate_with_two_prior_grievances(ai_service):
+    """A citizen with only two earlier grievances still gets a match"""
+    text = CITIZEN_A[0]["text"]
+    
+    duplicate = ai_service.detect_duplicates(text, CITIZEN_A)
+    
+    assert duplicate is not None
+    assert duplicate["duplicate_of_id"] == "a1"
+    assert duplicate["similarity_score"] == pytest.approx(1.0)
+    assert_matches_reference(ai_service, text, CITIZEN_A)
+
+
+def test_duplicate_detection_independent_of_earlier_citizens(ai_service):
+    """Checking citizen A first must not hide citizen B's duplicates"""
+    ai_service.detect_duplicates("Water supply cut again in our street", CITIZEN_A)
+    text = "Huge pothole on the main road near the school gate"
+    
+    duplicate = ai_service.detect_duplicates(text, CITIZEN_B)
+    
+    assert duplicate is not None
+    assert duplicate["duplicate_of_id"] == "b1"
+    assert_matches_reference(ai_service, text, CITIZEN_B)
+
+
+@pytest.mark.parametrize("text, existing", [
+    ("No water supply in our street since Monday", CITIZEN_A),
+    ("Electricity bill is far too high this month", CITIZEN_A),
+    ("Street lights broken on the main road", CITIZEN_B),
+    ("Garbage not collected from the market", CITIZEN_B),
+    ("Bus fares went up without notice", CITIZEN_B),
+])
+def test_detect_duplicates_matches_reference(ai_service, text, existing):
+    """Results agree with the original per-call TF-IDF fit"""
+    assert_matches_reference(ai_service, text, existing)
+
+
+def test_batch_matches_single_checks(ai_service):
+    """Batched checks give the same answers as one check per text"""
+    texts = [
+        "Huge pothole on the main road near the school",
+        "Bus fares went up without notice",
+        "Garbage not collected from the market for a week",
+    ]
+    
+    batch = ai_service.detect_duplicates_batch(texts, CITIZEN_B)
+    
+    assert [as_result(d) for d in batch] == [
+        as_result(ai_service.detect_duplicates(text, CITIZEN_B)) for text in texts
+    ]
+
+
+def test_concurrent_checks_match_single_checks(ai_service):
+    """Checks running in parallel threads don't see each other's fits"""
+    checks = [
+        ("No water supply in our street since Monday", CITIZEN_A),
+        ("Street lights broken on the main road", CITIZEN_B),
+        ("Garbage not collected from the market", CITIZEN_B),
+        ("Water supply pipeline leaking near the park", CITIZEN_A),
+    ] * 25
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda check: as_result(ai_service.detect_duplicates(*check)), checks
+        ))
+    
+    assert results == [as_result(ai_service.detect_duplicates(*check)) for check in checks]
+
+
+def test_no_existing_grievances(ai_service):
+    """Nothing to compare against means no duplicate"""
+    assert ai_service.detect_duplicates("No water supply", []) is None
@@ -1,7 +1,20 @@
 """Tests for authentication endpoints"""
 
+import asyncio
+
 import pytest
 from fastapi import status
+from passlib.hash import pbkdf2_sha256
+from sqlalchemy import select, update
+from uuid import UUID
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.utils import dependencies
+from app.utils.dependencies import _current_user_cache, invalidate_user
+
+# Every test registers the same user, so each needs an empty database
+pytestmark = pytest.mark.usefixtures("clean_database")
 
 
 def test_register_user(client, test_user_data):
@@ -88,3 +101,107 @@ def test_get_current_user(client, test_user_data):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert data["email"] == test_user_data["email"]
+
+
+def login(client, email, password):
+    """Log in and return the response"""
+    return client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": password}
+    )
+
+
+def test_login_sees_deactivation_right_away(client, test_user_data, db):
+    """Test that a user deactivated elsewhere can't log in on the next attempt"""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    assert login(client, test_user_data["email"], test_user_data["password"]).status_code == status.HTTP_200_OK
+    
+    # Another worker deactivates the account
+    db.execute(
+        update(User).where(User.email == test_user_data["email"]).values(is_active=False)
+    )
+    db.commit()
+    
+    response = login(client, test_user_data["email"], test_user_data["password"])
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_login_sees_password_change_right_away(client, test_user_data, db):
+    """Test that a password changed elsewhere takes effect on the next login"""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    assert login(client, test_user_data["email"], test_user_data["password"]).status_code == status.HTTP_200_OK
+    
+    # Another worker changes the password
+    db.execute(
+        update(User)
+        .where(User.email == test_user_data["email"])
+        .values(password_hash=get_password_hash("newpass12345"))
+    )
+    db.commit()
+    
+    old = login(client, test_user_data["email"], test_user_data["password"])
+    new = login(client, test_user_data["email"], "newpass12345")
+    assert old.status_code == status.HTTP_401_UNAUTHORIZED
+    assert new.status_code == status.HTTP_200_OK
+
+
+def test_login_upgrades_legacy_hash(client, test_user_data, db):
+    """Test that logging in with a pbkdf2 hash rewrites it as argon2"""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    db.execute(
+        update(User)
+        .where(User.email == test_user_data["email"])
+        .values(password_hash=pbkdf2_sha256.hash(test_user_data["password"]))
+    )
+    db.commit()
+    
+    assert login(client, test_user_data["email"], test_user_data["password"]).status_code == status.HTTP_200_OK
+    
+    stored = db.execute(
+        select(User.password_hash).where(User.email == test_user_data["email"])
+    ).scalar_one()
+    assert stored.startswith("$argon2")
+    assert login(client, test_user_data["email"], test_user_data["password"]).status_code == status.HTTP_200_OK
+
+
+class AsyncDictRedis:
+    """The few async Redis commands the user cache uses, kept in a dict"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+def test_deactivation_reaches_cached_sessions(client, test_user_data, db, monkeypatch):
+    """Test that invalidate_user drops the shared cached user for every token"""
+    redis = AsyncDictRedis()
+    monkeypatch.setattr(dependencies, "get_redis", lambda: redis)
+    
+    client.post("/api/v1/auth/register", json=test_user_data)
+    token = login(client, test_user_data["email"], test_user_data["password"]).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    assert redis.data
+    
+    # Another worker deactivates the user
+    db.execute(
+        update(User)
+        .where(User.email == test_user_data["email"])
+        .values(is_active=False)
+    )
+    db.commit()
+    asyncio.run(invalidate_user(UUID(user_id)))
+    
+    # This worker's in-process copy has expired
+    _current_user_cache.clear()
+    
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
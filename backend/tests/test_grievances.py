@@ -2,13 +2,14 @@
 
 import pytest
 from fastapi import status
+from app.models.attachment import Attachment
 from app.models.department import Department
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def auth_headers(client, test_user_data):
-    """Get authentication headers for test user"""
+    """Register and log in the test user once for the module"""
     client.post("/api/v1/auth/register", json=test_user_data)
     response = client.post(
         "/api/v1/auth/login",
@@ -21,9 +22,9 @@ def auth_headers(client, test_user_data):
     return {"Authorization": f"Bearer {token}"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_department(db):
-    """Create a test department"""
+    """Create a test department shared by the module"""
     dept = Department(
         name="Water Department",
         code="water",
@@ -42,7 +43,7 @@ def test_submit_grievance_success(client, test_user_data, test_grievance_data, a
     """Test successful grievance submission"""
     response = client.post(
         "/api/v1/grievances/submit",
-        json=test_grievance_data,
+        data=test_grievance_data,
         headers=auth_headers
     )
     
@@ -60,7 +61,7 @@ def test_submit_grievance_too_long(client, test_user_data, auth_headers):
     
     response = client.post(
         "/api/v1/grievances/submit",
-        json={
+        data={
             "title": "Test",
             "description": long_description
         },
@@ -70,12 +71,46 @@ def test_submit_grievance_too_long(client, test_user_data, auth_headers):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+def test_submit_grievance_with_overrides(client, auth_headers, test_department):
+    """Test that submitted category and urgency override the AI analysis"""
+    response = client.post(
+        "/api/v1/grievances/submit",
+        data={
+            "title": "Pipe burst",
+            "description": "A pipe burst outside our house this morning.",
+            "category": "water_supply",
+            "urgency": "critical"
+        },
+        headers=auth_headers
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["category"] == "water_supply"
+    assert data["urgency"] == "critical"
+
+
+def test_submit_grievance_invalid_category(client, auth_headers, test_department):
+    """Test that an unknown category is rejected before anything is saved"""
+    response = client.post(
+        "/api/v1/grievances/submit",
+        data={
+            "title": "Pipe burst",
+            "description": "A pipe burst outside our house this morning.",
+            "category": "plumbing"
+        },
+        headers=auth_headers
+    )
+    
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_get_citizen_grievances(client, test_user_data, test_grievance_data, auth_headers, db, test_department):
     """Test listing citizen's grievances"""
     # Submit grievance
     submit_response = client.post(
         "/api/v1/grievances/submit",
-        json=test_grievance_data,
+        data=test_grievance_data,
         headers=auth_headers
     )
     assert submit_response.status_code == status.HTTP_200_OK
@@ -97,7 +132,7 @@ def test_get_grievance_details(client, test_user_data, test_grievance_data, auth
     # Submit grievance
     submit_response = client.post(
         "/api/v1/grievances/submit",
-        json=test_grievance_data,
+        data=test_grievance_data,
         headers=auth_headers
     )
     grievance_id = submit_response.json()["grievance_id"]
@@ -114,12 +149,49 @@ def test_get_grievance_details(client, test_user_data, test_grievance_data, auth
     assert data["title"] == test_grievance_data["title"]
 
 
+def test_grievance_etag_covers_attachments(client, test_grievance_data, auth_headers, db, test_department):
+    """Test that adding an attachment invalidates a cached grievance"""
+    grievance_id = client.post(
+        "/api/v1/grievances/submit",
+        data=test_grievance_data,
+        headers=auth_headers
+    ).json()["grievance_id"]
+    
+    response = client.get(f"/api/v1/grievances/{grievance_id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    citizen_id = response.json()["citizen_id"]
+    
+    response = client.get(
+        f"/api/v1/grievances/{grievance_id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    # Attachments are separate rows; the grievance itself is unchanged
+    db.add(Attachment(
+        grievance_id=UUID(grievance_id),
+        file_name="photo.jpg",
+        file_size=1024,
+        file_type="image/jpeg",
+        file_url="/uploads/photo.jpg",
+        uploaded_by=UUID(citizen_id)
+    ))
+    db.commit()
+    
+    response = client.get(
+        f"/api/v1/grievances/{grievance_id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["file_name"] for a in response.json()["attachments"]] == ["photo.jpg"]
+
+
 def test_get_grievance_timeline(client, test_user_data, test_grievance_data, auth_headers, db, test_department):
     """Test getting grievance timeline"""
     # Submit grievance
     submit_response = client.post(
         "/api/v1/grievances/submit",
-        json=test_grievance_data,
+        data=test_grievance_data,
         headers=auth_headers
     )
     grievance_id = submit_response.json()["grievance_id"]
@@ -141,7 +213,7 @@ def test_add_comment(client, test_user_data, test_grievance_data, auth_headers,
     # Submit grievance
     submit_response = client.post(
         "/api/v1/grievances/submit",
-        json=test_grievance_data,
+        data=test_grievance_data,
         headers=auth_headers
     )
     grievance_id = submit_response.json()["grievance_id"]
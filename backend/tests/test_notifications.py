@@ -0,0 +1,148 @@
+"""Tests for notification delivery"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import email_service, notification_service
+from app.services.email_service import EmailService
+from app.services.notification_service import NotificationService
+
+
+class DictRedis:
+    """The few blocking Redis commands notification dedup uses, kept in a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Route notification dedup to an in-memory Redis"""
+    client = DictRedis()
+    monkeypatch.setattr(notification_service, "get_sync_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Deliver through a fake SendGrid call that records each email"""
+    emails = []
+    # Settings are frozen, so the service gets a copy with a key and dedup on
+    monkeypatch.setattr(notification_service, "settings", settings.model_copy(update={
+        "sendgrid_api_key": "test-key",
+        "notification_dedup_seconds": 300,
+        "async_notifications": False,
+    }))
+    monkeypatch.setattr(
+        EmailService, "send_email",
+        lambda to_email, subject, content: emails.append((to_email, subject)) or True
+    )
+    return emails
+
+
+def notify_status(comment=None):
+    """Send the same status update notification"""
+    return NotificationService.notify_status_update(
+        "citizen@example.com", "Test Citizen", "G-1", "submitted", "in_progress", comment
+    )
+
+
+def test_repeat_notification_is_skipped(redis, sent):
+    """Test that a retried notification is sent once even though its timestamp changed"""
+    for updated_at in ("2024-01-01 10:00:00", "2024-01-01 10:00:07"):
+        assert NotificationService.send_notification(
+            "citizen@example.com",
+            "status_updated",
+            {
+                "citizen_name": "Test Citizen",
+                "grievance_id": "G-1",
+                "previous_status": "submitted",
+                "status": "in_progress",
+                "updated_at": updated_at,
+                "comment_section": ""
+            }
+        )
+
+    assert len(sent) == 1
+
+
+def test_new_status_is_not_a_repeat(redis, sent):
+    """Test that notifications for different statuses are both sent"""
+    assert notify_status()
+    assert NotificationService.notify_status_update(
+        "citizen@example.com", "Test Citizen", "G-1", "in_progress", "resolved"
+    )
+
+    assert len(sent) == 2
+
+
+def test_failed_send_can_be_retried(redis, sent, monkeypatch):
+    """Test that a failed delivery doesn't block the next attempt"""
+    monkeypatch.setattr(EmailService, "send_email", lambda to_email, subject, content: False)
+    assert not notify_status()
+    assert not redis.data
+
+    monkeypatch.setattr(
+        EmailService, "send_email",
+        lambda to_email, subject, content: sent.append((to_email, subject)) or True
+    )
+    assert notify_status()
+
+    assert len(sent) == 1
+
+
+class RecordingSendGrid:
+    """SendGridAPIClient stand-in that keeps every request body it is given"""
+
+    requests = []
+
+    def __init__(self, api_key):
+        self.client = SimpleNamespace(mail=SimpleNamespace(send=SimpleNamespace(post=self.post)))
+
+    def post(self, request_body):
+        RecordingSendGrid.requests.append(request_body)
+        return SimpleNamespace(status_code=202)
+
+
+def test_batch_sends_one_personalized_request(redis, monkeypatch):
+    """Test that a batch becomes one SendGrid request with a personalization per recipient"""
+    keyed = settings.model_copy(update={"sendgrid_api_key": "test-key"})
+    monkeypatch.setattr(notification_service, "settings", keyed)
+    monkeypatch.setattr(email_service, "settings", keyed)
+    monkeypatch.setattr(email_service, "SendGridAPIClient", RecordingSendGrid)
+    RecordingSendGrid.requests.clear()
+
+    delivered = NotificationService.send_batch([
+        NotificationService.officer_assignment(
+            "first@example.com", "First Officer", "G-1", "Test Citizen",
+            "water_supply", "high", 0.8, "No water for three days"
+        ),
+        NotificationService.officer_assignment(
+            "second@example.com", "Second Officer", "G-2", "Other Citizen",
+            "electricity", "low", 0.25, "Street light flickering"
+        ),
+    ])
+
+    assert delivered == 2
+    assert len(RecordingSendGrid.requests) == 1
+    body = RecordingSendGrid.requests[0]
+    assert "-grievance_id-" in body["subject"]
+    assert "-officer_name-" in body["content"][0]["value"]
+    assert "-grievance_text-" in body["content"][0]["value"]
+
+    personalizations = {p["to"][0]["email"]: p["substitutions"] for p in body["personalizations"]}
+    assert personalizations["first@example.com"]["-officer_name-"] == "First Officer"
+    assert personalizations["first@example.com"]["-priority_score-"] == "0.80"
+    assert personalizations["second@example.com"]["-grievance_id-"] == "G-2"
+    assert personalizations["second@example.com"]["-grievance_text-"] == "Street light flickering"
@@ -0,0 +1,246 @@
+"""Tests for officer workflow endpoints"""
+
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, update
+from uuid import UUID
+
+from app.models.department import Department
+from app.models.grievance import Grievance, GrievanceStatus
+from app.models.user import User
+from app.services.grievance_service import GrievanceService
+from app.services.notification_service import NotificationService
+from tests.conftest import AsyncTestingSessionLocal
+
+# Each test registers the same users, so each needs an empty database
+pytestmark = pytest.mark.usefixtures("clean_database")
+
+
+def register_and_login(client, data):
+    """Register a user and return (auth headers, user id)"""
+    client.post("/api/v1/auth/register", json=data)
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": data["email"], "password": data["password"]}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    return headers, user_id
+
+
+@pytest.fixture
+def submitted_grievance(client, db, test_user_data, test_grievance_data):
+    """Submit a grievance as the test citizen and return its ID"""
+    db.add(Department(
+        name="Water Department",
+        code="water",
+        email="water@example.com",
+        categories="water_supply",
+        max_capacity=100,
+        current_load=0
+    ))
+    db.commit()
+    
+    headers, _ = register_and_login(client, test_user_data)
+    response = client.post(
+        "/api/v1/grievances/submit",
+        data=test_grievance_data,
+        headers=headers
+    )
+    return response.json()["grievance_id"]
+
+
+def test_officer_checks_see_reassignment(client, db, submitted_grievance, test_officer_data):
+    """Test that a reassignment made elsewhere is honoured by the next request"""
+    officer_headers, _ = register_and_login(client, test_officer_data)
+    other_headers, other_id = register_and_login(client, {
+        **test_officer_data,
+        "email": "other.officer@example.com"
+    })
+    
+    response = client.post(
+        f"/api/v1/officers/{submitted_grievance}/accept",
+        headers=officer_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    
+    response = client.post(
+        f"/api/v1/officers/{submitted_grievance}/mark-in-progress",
+        headers=other_headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    # Another worker reassigns the grievance
+    db.execute(
+        update(Grievance)
+        .where(Grievance.id == UUID(submitted_grievance))
+        .values(officer_id=UUID(other_id))
+    )
+    db.commit()
+    
+    response = client.post(
+        f"/api/v1/officers/{submitted_grievance}/mark-in-progress",
+        headers=officer_headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    response = client.post(
+        f"/api/v1/officers/{submitted_grievance}/mark-in-progress",
+        headers=other_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_listing_totals_follow_workflow(client, submitted_grievance, test_user_data, test_officer_data):
+    """Test that cached listing totals track submission, assignment and status changes"""
+    citizen_headers, _ = register_and_login(client, test_user_data)
+    officer_headers, _ = register_and_login(client, test_officer_data)
+    urgency = client.get(
+        "/api/v1/grievances/", headers=citizen_headers
+    ).json()["items"][0]["urgency"]
+    
+    def citizen_total(status_value=None):
+        params = {"status": status_value} if status_value else {}
+        return client.get(
+            "/api/v1/grievances/", params=params, headers=citizen_headers
+        ).json()["total"]
+    
+    def officer_total(status_value=None, urgency_value=None):
+        params = {}
+        if status_value:
+            params["status_filter"] = status_value
+        if urgency_value:
+            params["urgency_filter"] = urgency_value
+        return client.get(
+            "/api/v1/officers/me/assigned", params=params, headers=officer_headers
+        ).json()["total"]
+    
+    # Warm the cache before each change so stale totals would be served
+    assert citizen_total("submitted") == 1
+    assert citizen_total("under_review") == 0
+    assert officer_total() == 0
+    assert officer_total("under_review", urgency) == 0
+    
+    client.post(f"/api/v1/officers/{submitted_grievance}/accept", headers=officer_headers)
+    
+    assert citizen_total("submitted") == 0
+    assert citizen_total("under_review") == 1
+    assert officer_total() == 1
+    assert officer_total("under_review", urgency) == 1
+    assert officer_total("in_progress") == 0
+    
+    client.post(
+        f"/api/v1/officers/{submitted_grievance}/mark-in-progress",
+        headers=officer_headers
+    )
+    
+    assert citizen_total("under_review") == 0
+    assert citizen_total("in_progress") == 1
+    assert officer_total("under_review", urgency) == 0
+    assert officer_total("in_progress") == 1
+    
+    client.post(
+        "/api/v1/grievances/submit",
+        data={
+            "title": "Streetlight not working",
+            "description": "The streetlight outside number 12 has been out for a week."
+        },
+        headers=citizen_headers
+    )
+    
+    assert citizen_total() == 2
+    assert citizen_total("submitted") == 1
+    assert citizen_total("in_progress") == 1
+
+
+def test_assign_backlog_spreads_grievances(client, db, submitted_grievance, test_user_data, test_officer_data, monkeypatch):
+    """Test that bulk assignment evens out officer loads within the department"""
+    citizen_headers, _ = register_and_login(client, test_user_data)
+    admin_headers, _ = register_and_login(client, {
+        **test_officer_data, "email": "admin@example.com", "role": "admin"
+    })
+    officer_ids = [
+        UUID(register_and_login(client, {**test_officer_data, "email": f"officer{n}@example.com"})[1])
+        for n in range(3)
+    ]
+    busy, idle, inactive = officer_ids
+    
+    department_id = db.query(Department.id).scalar()
+    db.execute(
+        update(User).where(User.id.in_(officer_ids)).values(department_id=department_id)
+    )
+    db.execute(update(User).where(User.id == inactive).values(is_active=False))
+    # The busy officer already holds the first grievance
+    db.execute(
+        update(Grievance)
+        .where(Grievance.id == UUID(submitted_grievance))
+        .values(officer_id=busy, status=GrievanceStatus.UNDER_REVIEW)
+    )
+    db.commit()
+    
+    for description in (
+        "Water pipeline burst near the market, flooding the street.",
+        "Sewage overflowing into the drinking water line at block C.",
+        "Public tap on the main road has been dry since Monday.",
+    ):
+        client.post(
+            "/api/v1/grievances/submit",
+            data={"title": "Water issue", "description": description},
+            headers=citizen_headers
+        )
+    
+    response = client.post("/api/v1/officers/assign-backlog", headers=citizen_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    batches = []
+    monkeypatch.setattr(NotificationService, "send_batch", batches.append)
+    
+    response = client.post("/api/v1/officers/assign-backlog", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"assigned": 3, "unassigned": 0}
+    
+    db.expire_all()
+    loads = dict(
+        db.query(Grievance.officer_id, func.count(Grievance.id))
+        .group_by(Grievance.officer_id)
+        .all()
+    )
+    assert loads == {busy: 2, idle: 2}
+    
+    # Every assigned officer is emailed, in a single batch
+    assert len(batches) == 1
+    assert sorted(email for email, _, _ in batches[0]) == [
+        "officer0@example.com", "officer1@example.com", "officer1@example.com"
+    ]
+    assert {template for _, template, _ in batches[0]} == {"officer_assignment"}
+    assert {variables["citizen_name"] for _, _, variables in batches[0]} == {
+        test_user_data["full_name"]
+    }
+
+
+def test_reassignment_updates_both_officers_totals(client, submitted_grievance, test_officer_data):
+    """Test that reassigning drops the previous officer's cached totals too"""
+    first_headers, _ = register_and_login(client, test_officer_data)
+    second_headers, second_id = register_and_login(client, {
+        **test_officer_data, "email": "second.officer@example.com"
+    })
+    
+    def total(headers):
+        return client.get("/api/v1/officers/me/assigned", headers=headers).json()["total"]
+    
+    client.post(f"/api/v1/officers/{submitted_grievance}/accept", headers=first_headers)
+    assert total(first_headers) == 1
+    assert total(second_headers) == 0
+    
+    async def reassign():
+        async with AsyncTestingSessionLocal() as session:
+            return await GrievanceService.assign_officer(
+                session, UUID(submitted_grievance), UUID(second_id)
+            )
+    
+    assert asyncio.run(reassign())
+    
+    assert total(first_headers) == 0
+    assert total(second_headers) == 1